@@ -1,14 +1,26 @@
-from importlib.metadata import version, PackageNotFoundError
-
 __all__ = ["__version__"]
 
-try:
-    __version__ = version("openmower-cli")
-except PackageNotFoundError:
-    # Fallback when running from source without installation; try setuptools_scm if available
+
+def _get_version() -> str:
+    from importlib.metadata import version, PackageNotFoundError
+
     try:
-        from setuptools_scm import get_version as _get_version  # type: ignore
+        return version("openmower-cli")
+    except PackageNotFoundError:
+        # Fallback when running from source without installation; try setuptools_scm if available
+        try:
+            from setuptools_scm import get_version as _get_version  # type: ignore
+
+            return _get_version(root="..", relative_to=__file__)
+        except Exception:
+            return "0.0.0.dev0"
+
 
-        __version__ = _get_version(root="..", relative_to=__file__)
-    except Exception:
-        __version__ = "0.0.0.dev0"
+def __getattr__(name: str):
+    # Resolved lazily: importlib.metadata is comparatively slow to import and the shell completion
+    # fast path never needs the version.
+    if name == "__version__":
+        global __version__
+        __version__ = _get_version()
+        return __version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,54 @@
 import os
+import sys
+
+# Answer shell completion requests from caches before the heavy imports below (see completion.py)
+from openmower_cli.completion import fast_complete, completing
+fast_complete()
+
 import typer
 import openmower_cli.openmower_commands
 import openmower_cli.openmower_legacy_commands
 import openmower_cli.openmower_common_commands
-from openmower_cli.console import warn
+from openmower_cli.console import warn, event, json_mode, set_output_mode
 from openmower_cli.helpers import env_bool
 from openmower_cli import __version__
 from dotenv import load_dotenv  # required dependency
 
 from openmower_cli.constants import ENV_PATH
 
+def _early_output_mode(argv: list[str]) -> None:
+    """Honour --output before typer parses it, so messages emitted during app setup are already structured.
+
+    Only the global options before the command name are scanned; arguments of the command (e.g. a
+    command run by `exec`) are left alone.
+    """
+    i = 0
+    while i < len(argv) and argv[i].startswith("-"):
+        arg = argv[i]
+        value = None
+        if arg in ("--output", "-o"):
+            if i + 1 >= len(argv):
+                return
+            value = argv[i + 1]
+            i += 1
+        elif arg.startswith("--output="):
+            value = arg.split("=", 1)[1]
+        if value is not None:
+            try:
+                set_output_mode(value)
+            except ValueError:
+                pass  # typer reports the invalid value
+        i += 1
+
+
 def create_app():
+    _early_output_mode(sys.argv[1:])
+    # Completion output is parsed by the shell: no warnings, no network
+    is_completing = completing()
     if os.path.exists(ENV_PATH):
         # Do not override already-set environment variables
         load_dotenv(dotenv_path=ENV_PATH, override=False)
-    else:
+    elif not is_completing:
         warn(f"Environment file {ENV_PATH} not found. Using system environment variables.")
 
     app = typer.Typer(
@@ -32,21 +66,32 @@ def create_app():
             help="Show the OpenMower CLI version and exit.",
             callback=lambda v: (_print_version_and_exit() if v else None),
             is_eager=True,
-        )
+        ),
+        output: str = typer.Option(
+            "text",
+            "--output",
+            "-o",
+            envvar="OPENMOWER_OUTPUT",
+            help="Output format: 'text' (rich console) or 'json' (one NDJSON event per line).",
+            callback=_set_output_mode,
+            is_eager=True,
+        ),
     ):
         pass
 
     # Perform a lightweight update check at startup (at most once every 7 days)
     try:
-        from openmower_cli.helpers import check_for_update_if_needed
-        check_for_update_if_needed(__version__)
+        if not is_completing:
+            from openmower_cli.helpers import check_for_update_if_needed
+            check_for_update_if_needed(__version__)
     except Exception:
         # Never block startup for update checks
         pass
 
     is_v2_hardware = env_bool("V2_HARDWARE")
     if is_v2_hardware is None:
-        warn("V2_HARDWARE environment variable not set. Using legacy commands.")
+        if not is_completing:
+            warn("V2_HARDWARE environment variable not set. Using legacy commands.")
         is_v2_hardware = False
 
     if is_v2_hardware:
@@ -57,8 +102,19 @@ def create_app():
     return app
 
 
+def _set_output_mode(value: str) -> str:
+    try:
+        set_output_mode(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    return value
+
+
 def _print_version_and_exit():
-    typer.echo(__version__)
+    if json_mode():
+        event("result", flush=True, ok=True, version=__version__)
+    else:
+        typer.echo(__version__)
     raise typer.Exit()
 
 app = create_app()
@@ -0,0 +1,214 @@
+import json
+import os
+import re
+import shlex
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from openmower_cli.constants import COMPOSE_FILE, CACHE_DIR, DEFAULT_GH_REPO
+
+# Shell completion fast path.
+#
+# TAB presses re-run the whole CLI. This module answers the common dynamic completions (service names,
+# release tags) from small caches using only the standard library, before typer, rich, requests or the
+# command modules are imported. Anything it does not know about falls through to typer's completion.
+
+COMPLETE_VAR = "_OPENMOWER_COMPLETE"
+SERVICE_INDEX_FILE = CACHE_DIR / "compose-services.json"
+
+# Commands whose positional arguments are service names
+_SERVICE_ARG_COMMANDS = {"logs", "logs-capture"}
+# Commands whose first positional argument is a service name
+_SERVICE_FIRST_COMMANDS = {"exec", "shell"}
+# Global options that consume a value
+_GLOBAL_VALUE_OPTIONS = {"--output", "-o"}
+# Per-command options that consume a value (so their values are not mistaken for positionals)
+_VALUE_OPTIONS = {"--since", "--until", "--segment-size", "--segment-age", "--keep", "--services",
+                  "--version", "-v", "--repo"}
+
+_SERVICES_KEY_RE = re.compile(r"^services:\s*(#.*)?$")
+_TOP_LEVEL_KEY_RE = re.compile(r"^[A-Za-z0-9_.-]+:")
+_CHILD_KEY_RE = re.compile(r"""^( +)["']?([A-Za-z0-9_.-]+)["']?\s*:""")
+
+
+def parse_compose_services(text: str) -> List[str]:
+    """Extract the keys of the top-level `services:` mapping from compose YAML, without a YAML parser."""
+    services: List[str] = []
+    in_services = False
+    indent: Optional[int] = None
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if _SERVICES_KEY_RE.match(line):
+            in_services = True
+            continue
+        if not in_services:
+            continue
+        if _TOP_LEVEL_KEY_RE.match(line):
+            break
+        m = _CHILD_KEY_RE.match(line)
+        if m is None:
+            continue
+        if indent is None:
+            indent = len(m.group(1))
+        if len(m.group(1)) == indent:
+            services.append(m.group(2))
+    return services
+
+
+def compose_services(compose_file: str = COMPOSE_FILE) -> List[str]:
+    """Service names of the compose file, cached by the file's mtime and size."""
+    try:
+        st = os.stat(compose_file)
+    except OSError:
+        return []
+    key = [compose_file, st.st_mtime_ns, st.st_size]
+    try:
+        with open(SERVICE_INDEX_FILE, "r") as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            return cached["services"]
+    except Exception:
+        pass
+    try:
+        with open(compose_file, "r") as f:
+            services = parse_compose_services(f.read())
+    except OSError:
+        return []
+    try:
+        SERVICE_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SERVICE_INDEX_FILE.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"key": key, "services": services}, f)
+        os.replace(tmp, SERVICE_INDEX_FILE)
+    except OSError:
+        pass
+    return services
+
+
+def release_tags_file(repo: str) -> Path:
+    return CACHE_DIR / f"releases-{repo.replace('/', '_')}.json"
+
+
+def cached_release_tags(repo: str = DEFAULT_GH_REPO) -> List[str]:
+    """Release tags from the metadata cache written by the update check (newest first). Never hits the network."""
+    try:
+        with open(release_tags_file(repo), "r") as f:
+            return json.load(f).get("tags", [])
+    except Exception:
+        return []
+
+
+def store_release_tags(repo: str, tags: List[str]) -> None:
+    try:
+        path = release_tags_file(repo)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"tags": tags}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _split(s: str) -> List[str]:
+    try:
+        return shlex.split(s)
+    except ValueError:
+        return s.split()
+
+
+def _completion_args(shell: str) -> Tuple[List[str], str]:
+    """Return (args before the word being completed, incomplete word), like typer's completion classes."""
+    if shell == "bash":
+        words = _split(os.environ.get("COMP_WORDS", ""))
+        cword = int(os.environ.get("COMP_CWORD", "0"))
+        return words[1:cword], words[cword] if cword < len(words) else ""
+    raw = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+    words = _split(raw)[1:]
+    if shell in ("powershell", "pwsh"):
+        incomplete = os.environ.get("_TYPER_COMPLETE_WORD_TO_COMPLETE", "")
+        return (words[:-1] if incomplete else words), incomplete
+    if words and not raw.endswith(" "):
+        return words[:-1], words[-1]
+    return words, ""
+
+
+def candidates(args: List[str], incomplete: str) -> Optional[List[str]]:
+    """Dynamic completions for the given command line, or None if typer should handle it."""
+    i = 0
+    while i < len(args) and args[i].startswith("-"):
+        i += 2 if args[i] in _GLOBAL_VALUE_OPTIONS else 1
+    if i >= len(args):
+        return None
+    command, rest = args[i], args[i + 1:]
+    prev = rest[-1] if rest else None
+
+    if command == "self-update" and prev in ("--version", "-v"):
+        return [t for t in cached_release_tags() if t.startswith(incomplete)]
+    if incomplete.startswith("-"):
+        return None
+
+    if command in _SERVICE_FIRST_COMMANDS and prev == "--services":
+        done, _, last = incomplete.rpartition(",")
+        chosen = set(done.split(",")) if done else set()
+        prefix = f"{done}," if done else ""
+        return [prefix + s for s in compose_services() if s.startswith(last) and s not in chosen]
+    if prev in _VALUE_OPTIONS:
+        return None
+    if command in _SERVICE_FIRST_COMMANDS and ("--all" in rest or "--services" in rest):
+        return None  # the first positional is the command to run, not a service
+
+    positionals = []
+    j = 0
+    while j < len(rest):
+        if rest[j].startswith("-"):
+            j += 2 if rest[j] in _VALUE_OPTIONS else 1
+            continue
+        positionals.append(rest[j])
+        j += 1
+    if command in _SERVICE_ARG_COMMANDS or (command in _SERVICE_FIRST_COMMANDS and not positionals):
+        return [s for s in compose_services() if s.startswith(incomplete) and s not in positionals]
+    return None
+
+
+def _format(shell: str, values: List[str]) -> str:
+    if shell == "zsh":
+        if not values:
+            return "_files"
+        quoted = "\n".join('"{}"'.format(v.replace('"', '""').replace("'", "''").replace("$", "\\$")
+                                         .replace("`", "\\`").replace(":", r"\\:")) for v in values)
+        return f"_arguments '*: :(({quoted}))'"
+    if shell in ("powershell", "pwsh"):
+        return "\n".join(f"{v}::: " for v in values)
+    return "\n".join(values)
+
+
+def fast_complete() -> None:
+    """Answer a completion request and exit if it can be answered here; otherwise return to the full app."""
+    instruction = os.environ.get(COMPLETE_VAR, "")
+    if not instruction.startswith("complete_"):
+        return
+    shell = instruction[len("complete_"):]
+    try:
+        args, incomplete = _completion_args(shell)
+        values = candidates(args, incomplete)
+    except Exception:
+        return
+    if values is None:
+        return
+    if shell == "fish":
+        action = os.environ.get("_TYPER_COMPLETE_FISH_ACTION", "")
+        if action == "is-args":
+            sys.exit(0 if values else 1)
+        if values:
+            sys.stdout.write("\n".join(values))
+        sys.exit(0)
+    sys.stdout.write(_format(shell, values))
+    sys.exit(0)
+
+
+def completing() -> bool:
+    """Whether this process was started by a shell completion script."""
+    return COMPLETE_VAR in os.environ
@@ -1,21 +1,109 @@
+import atexit
+import json
+import os
+import sys
+import time
+
 from rich import print
 
+# Output mode: "text" renders with rich, "json" writes one NDJSON event per line to stdout.
+OUTPUT_MODES = ("text", "json")
+_mode: str = os.environ.get("OPENMOWER_OUTPUT", "text")
+
+
+class _NdjsonWriter:
+    """Buffered NDJSON event writer. Bypasses rich entirely; flushes on important events, periodically and at exit."""
+
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buf: list[str] = []
+        self._last_flush = time.monotonic()
+
+    def emit(self, type_: str, flush: bool = False, **fields) -> None:
+        fields = {"ts": round(time.time(), 6), "type": type_, **fields}
+        self._buf.append(json.dumps(fields, separators=(",", ":"), default=str))
+        if flush or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        try:
+            self._buf.append("")
+            self._stream.write("\n".join(self._buf))
+            self._stream.flush()
+        except (BrokenPipeError, ValueError):
+            # Consumer went away (e.g. `| head`) or stdout was closed; drop further output quietly
+            self._stream = open(os.devnull, "w")
+        self._buf.clear()
+        self._last_flush = time.monotonic()
+
+
+_writer = _NdjsonWriter(sys.stdout)
+atexit.register(_writer.flush)
+
+
+def set_output_mode(mode: str) -> None:
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Invalid output mode {mode!r}. Use one of {list(OUTPUT_MODES)}")
+    global _mode
+    _mode = mode
+
+
+def json_mode() -> bool:
+    return _mode == "json"
+
+
+def event(type_: str, flush: bool = False, **fields) -> None:
+    """Emit a typed NDJSON event. No-op in text mode."""
+    if _mode == "json":
+        _writer.emit(type_, flush=flush, **fields)
+
+
+def flush() -> None:
+    """Flush pending NDJSON events, e.g. before handing the terminal to a subprocess."""
+    if _mode == "json":
+        _writer.flush()
+
+
 def warn(message: str) -> None:
     """Print a warning message in a consistent format."""
+    if _mode == "json":
+        _writer.emit("warning", message=message)
+        return
     print(f"[bold yellow]:warning: Warning:[/bold yellow] {message}")
 
 def info(message: str) -> None:
     """Print an info message in a consistent format."""
+    if _mode == "json":
+        _writer.emit("phase", message=message)
+        return
     print(f"[bold cyan]:information_source: Info:[/bold cyan] {message}")
 
 def debug(message: str) -> None:
     """Print a debug message in a consistent format."""
+    if _mode == "json":
+        _writer.emit("debug", message=message)
+        return
     print(f"[bold grey]Debug:[/bold grey] {message}")
 
 def error(message: str) -> None:
     """Print an error message in a consistent format."""
+    if _mode == "json":
+        _writer.emit("error", flush=True, message=message)
+        return
     print(f"[bold red]:cross_mark: Error:[/bold red] {message}")
 
 def success(message: str) -> None:
     """Print a success message in a consistent format."""
+    if _mode == "json":
+        _writer.emit("result", flush=True, ok=True, message=message)
+        return
     print(f"[bold green]:heavy_check_mark:[/bold green] {message}")
+
+def progress(message: str, done: int | None = None, total: int | None = None) -> None:
+    """Report progress of a long-running step. Only emitted in JSON mode; text mode reports phases via info()."""
+    if _mode == "json":
+        _writer.emit("progress", message=message, done=done, total=total)
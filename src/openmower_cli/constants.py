@@ -17,6 +17,21 @@ DEFAULT_GH_REPO: str = os.environ.get("OPENMOWER_CLI_REPO", "ClemensElflein/open
 
 # Firmware repo (can be overridden via env)
 FW_REPO: str = os.environ.get("OPENMOWER_FW_REPO", "xtech/fw-openmower-v2")
+# Legacy (RP2040) firmware: firmware.zip asset of the rolling "latest" release
+LEGACY_FW_REPO: str = os.environ.get("OPENMOWER_LEGACY_FW_REPO", "ClemensElflein/OpenMower")
 
 # Paths for internal state/cache files
 LAST_CHECK_FILE: Path = Path(os.path.expanduser("~/.config/openmower-cli/last_update_check.json"))
+
+# Persistent log archive written by `openmower logs-capture`
+LOG_ARCHIVE_DIR: Path = Path(os.environ.get("OPENMOWER_LOG_ARCHIVE_DIR", "/opt/stacks/openmower/log-archive"))
+
+# CLI state (last firmware flash, download counters) and caches
+STATE_FILE: Path = Path(os.path.expanduser("~/.config/openmower-cli/state.json"))
+CACHE_DIR: Path = Path(os.environ.get("OPENMOWER_CACHE_DIR", os.path.expanduser("~/.cache/openmower-cli")))
+
+# Per-device counters shared by running `expose-xesc` bridges
+XESC_STATS_DIR: Path = Path(os.environ.get("OPENMOWER_XESC_STATS_DIR", "/tmp/openmower-cli/xesc"))
+
+# Prometheus exporter
+METRICS_PORT: int = int(os.environ.get("OPENMOWER_METRICS_PORT", "9811"))
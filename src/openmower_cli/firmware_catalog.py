@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from openmower_cli.constants import CACHE_DIR, FW_REPO, LEGACY_FW_REPO
+from openmower_cli.helpers import fetch_github_release, bump_counters
+from openmower_cli import remote_zip
+
+# Catalog of firmware variants in a release zip, read remotely with HTTP range requests.
+#
+# The table of contents of each release asset is cached under CACHE_DIR/firmware-toc, keyed by the
+# asset's id and update time, so listing or validating variants of a known release costs one small
+# GitHub API request and fetching a variant only downloads that member.
+
+TOC_CACHE_DIR = CACHE_DIR / "firmware-toc"
+
+
+class FirmwareSource:
+    """Where a hardware generation's firmware lives and how variants map to zip members."""
+
+    def __init__(self, name: str, repo: str, tag: Optional[str], asset: Optional[str], member: str, env_var: str):
+        self.name = name
+        self.repo = repo
+        self.tag = tag  # None: latest release
+        self.asset = asset  # None: first .zip asset
+        self.member = member  # format string with {variant}
+        self.env_var = env_var
+        prefix, _, suffix = member.partition("{variant}")
+        self._member_re = re.compile(f"^{re.escape(prefix)}([^/]+){re.escape(suffix)}$")
+
+    def variant_of(self, member_name: str) -> Optional[str]:
+        m = self._member_re.match(member_name)
+        return m.group(1) if m else None
+
+    def member_for(self, variant: str) -> str:
+        return self.member.format(variant=variant)
+
+
+V2_SOURCE = FirmwareSource("v2", FW_REPO, None, None, "openmower-{variant}.bin", "MOWER")
+LEGACY_SOURCE = FirmwareSource("legacy", LEGACY_FW_REPO, "latest", "firmware.zip", "firmware/{variant}/firmware.elf",
+                               "OM_HARDWARE_VERSION")
+
+
+def _session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({"Accept": "application/octet-stream"})
+    return session
+
+
+def resolve_asset(source: FirmwareSource, tag: Optional[str] = None) -> Tuple[str, dict]:
+    """Return (tag name, asset metadata) of the source's firmware zip in the given (or default) release."""
+    rel = fetch_github_release(source.repo, tag or source.tag)
+    for a in rel.get("assets", []):
+        name = a.get("name", "")
+        if (source.asset and name == source.asset) or (not source.asset and name.endswith(".zip")):
+            return rel.get("tag_name") or tag or source.tag or "", a
+    raise RuntimeError(f"No firmware zip asset found in release {rel.get('tag_name') or 'latest'} of {source.repo}.")
+
+
+def _toc_cache_path(source: FirmwareSource, asset: dict) -> Path:
+    key = f"{source.repo}:{asset.get('id')}:{asset.get('updated_at')}:{asset.get('size')}"
+    return TOC_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+
+def load_toc(source: FirmwareSource, asset: dict, refresh: bool = False) -> List[Dict]:
+    """Table of contents of the asset's zip, from cache or via range requests."""
+    path = _toc_cache_path(source, asset)
+    if not refresh:
+        try:
+            with open(path, "r") as f:
+                entries = json.load(f)["entries"]
+            bump_counters(cache_hits_total=1)
+            return entries
+        except Exception:
+            pass
+    bump_counters(cache_misses_total=1)
+    entries = remote_zip.read_toc(_session(), asset["browser_download_url"])
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"asset": asset.get("name"), "entries": entries}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return entries
+
+
+def variants(source: FirmwareSource, entries: List[Dict]) -> Dict[str, Dict]:
+    """Map variant name (MOWER / OM_HARDWARE_VERSION value) to its zip entry."""
+    result = {}
+    for e in entries:
+        v = source.variant_of(e["name"])
+        if v is not None:
+            result[v] = e
+    return dict(sorted(result.items()))
+
+
+def catalog(source: FirmwareSource, tag: Optional[str] = None, refresh: bool = False) -> Tuple[str, dict, Dict[str, Dict]]:
+    """Return (tag name, asset, variants) for a release."""
+    tag_name, asset = resolve_asset(source, tag)
+    return tag_name, asset, variants(source, load_toc(source, asset, refresh))
+
+
+def fetch_variant(asset: dict, entry: Dict, dest: Path) -> None:
+    """Download only the given member of the asset's zip to `dest` (CRC-32 verified)."""
+    started = time.monotonic()
+    data = remote_zip.fetch_member(_session(), asset["browser_download_url"], entry)
+    bump_counters(downloads_total=1, download_bytes_total=entry["compressed_size"],
+                  download_seconds_total=time.monotonic() - started)
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
@@ -1,16 +1,21 @@
 import os
+import re
 import subprocess
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
 import requests
-from openmower_cli.console import error, warn, info
+from openmower_cli.console import error, warn, info, event, flush, json_mode, progress
+import sys
+import time
 import typer
 import tempfile
+import threading
+import hashlib
 import zipfile
 from pathlib import Path
-from openmower_cli.constants import LAST_CHECK_FILE, DEFAULT_GH_REPO
+from openmower_cli.constants import LAST_CHECK_FILE, DEFAULT_GH_REPO, STATE_FILE, COMPOSE_FILE, DOCKER_BIN
 
 TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
 FALSE_VALUES = {"0", "false", "f", "no", "n", "off"}
@@ -30,15 +35,102 @@ def env_bool(name: str) -> bool | None:
 
 
 def run(cmd: List[str]) -> None:
-    """Run a command, streaming output, and exit with its return code if it fails."""
+    """Run a command, streaming output, and exit with its return code if it fails.
+
+    In JSON output mode, start and exit events are emitted and the child's stdout is sent to stderr
+    so stdout stays valid NDJSON.
+    """
+    event("process_start", cmd=cmd)
+    flush()
+    started = time.monotonic()
     try:
         # Use check=False so we can propagate return code cleanly
-        proc = subprocess.run(cmd)
-        if proc.returncode != 0:
-            raise typer.Exit(code=proc.returncode)
+        proc = subprocess.run(cmd, stdout=sys.stderr if json_mode() else None)
     except FileNotFoundError as e:
+        event("process_exit", cmd=cmd, code=127, duration=round(time.monotonic() - started, 3))
         error(f"{e}")
         raise typer.Exit(code=127)
+    event("process_exit", flush=True, cmd=cmd, code=proc.returncode, duration=round(time.monotonic() - started, 3))
+    if proc.returncode != 0:
+        raise typer.Exit(code=proc.returncode)
+
+
+def run_parallel(cmds: Dict[str, List[str]]) -> Dict[str, int]:
+    """Run several commands concurrently, streaming their combined output line by line with a name prefix.
+
+    Returns the exit code per name (127 if the command could not be started, 128+N if it was killed by
+    signal N, like a shell would report it). In JSON output mode each
+    line becomes an `output` event instead.
+    """
+    width = max((len(n) for n in cmds), default=0)
+    lock = threading.Lock()
+    codes: Dict[str, int] = {}
+    procs: Dict[str, subprocess.Popen] = {}
+    started = time.monotonic()
+
+    for name, cmd in cmds.items():
+        event("process_start", name=name, cmd=cmd)
+        try:
+            procs[name] = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                           stderr=subprocess.STDOUT, text=True, errors="replace")
+        except FileNotFoundError as e:
+            error(f"{name}: {e}")
+            codes[name] = 127
+
+    def _pump(name: str, proc: subprocess.Popen) -> None:
+        prefix = f"{name:<{width}} | "
+        for line in proc.stdout:
+            with lock:
+                if json_mode():
+                    event("output", name=name, line=line.rstrip("\n"))
+                else:
+                    sys.stdout.write(prefix + line if line.endswith("\n") else prefix + line + "\n")
+                    sys.stdout.flush()
+        code = proc.wait()
+        codes[name] = 128 - code if code < 0 else code
+        with lock:
+            event("process_exit", name=name, cmd=cmds[name], code=codes[name],
+                  duration=round(time.monotonic() - started, 3))
+
+    threads = [threading.Thread(target=_pump, args=(n, p), daemon=True) for n, p in procs.items()]
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            t.join()
+    except KeyboardInterrupt:
+        for p in procs.values():
+            p.terminate()
+        raise typer.Exit(code=130)
+    flush()
+    return {name: codes[name] for name in cmds}
+
+
+def compose_project_name() -> str:
+    """Project name docker compose uses for the stack (and its container labels).
+
+    Asks `docker compose config`, which honours a top-level `name:` and COMPOSE_PROJECT_NAME; falls back to
+    the compose file's directory name like docker compose does.
+    """
+    try:
+        proc = subprocess.run([DOCKER_BIN, "compose", "-f", COMPOSE_FILE, "config", "--format", "json"],
+                              capture_output=True, text=True, timeout=30)
+        if proc.returncode == 0:
+            name = json.loads(proc.stdout).get("name")
+            if name:
+                return name
+    except (OSError, subprocess.SubprocessError, ValueError):
+        pass
+    name = os.environ.get("COMPOSE_PROJECT_NAME") or Path(COMPOSE_FILE).resolve().parent.name
+    return re.sub(r"[^a-z0-9_-]", "", name.lower())
+
+
+def human_bytes(n: float) -> str:
+    """Format a byte count (or rate) with a binary unit, e.g. 1.5MiB."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(n) < 1024 or unit == "GiB":
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
 
 
 def which(cmd: str) -> Optional[str]:
@@ -66,16 +158,62 @@ def _read_last_check_ts() -> Optional[datetime]:
     return None
 
 
-def _write_last_check_ts(now: Optional[datetime] = None) -> None:
+def _write_last_check_ts(now: Optional[datetime] = None, result: Optional[str] = None,
+                         latest: Optional[str] = None) -> None:
     try:
         ts = (now or datetime.now()).isoformat()
         LAST_CHECK_FILE.parent.mkdir(parents=True, exist_ok=True)
         with open(LAST_CHECK_FILE, "w") as f:
-            json.dump({"last_check": ts}, f)
+            json.dump({"last_check": ts, "result": result, "latest": latest}, f)
     except Exception:
         pass
 
 
+def read_last_check() -> dict:
+    """Return the stored update check record ({'last_check', 'result', 'latest'}), or {} if none."""
+    try:
+        with open(LAST_CHECK_FILE, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def load_state() -> dict:
+    """Load persisted CLI state (last firmware flash, counters). Returns {} if missing or unreadable."""
+    try:
+        with open(STATE_FILE, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_state(state: dict) -> None:
+    try:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_FILE.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, STATE_FILE)
+    except Exception:
+        pass
+
+
+def record_state(key: str, **fields) -> None:
+    """Persist the latest outcome of an operation (e.g. firmware_flash) with a timestamp. Never raises."""
+    state = load_state()
+    state[key] = {"ts": time.time(), **fields}
+    _save_state(state)
+
+
+def bump_counters(**increments: float) -> None:
+    """Add to persisted counters (e.g. downloads_total=1). Never raises."""
+    state = load_state()
+    counters = state.setdefault("counters", {})
+    for name, inc in increments.items():
+        counters[name] = counters.get(name, 0) + inc
+    _save_state(state)
+
+
 def _parse_version(v: str) -> List[int]:
     v = v.strip()
     if v.startswith("v"):
@@ -113,19 +251,25 @@ def check_for_update_if_needed(current_version: str, repo: str = DEFAULT_GH_REPO
         if last and (now - last) < timedelta(days=max_age_days):
             return
         info("Checking for new version")
-        # perform check
-        url = f"https://api.github.com/repos/{repo}/releases/latest"
+        # perform check; the release list (newest first) also refreshes the tag cache used by shell completion
+        url = f"https://api.github.com/repos/{repo}/releases?per_page=30"
         r = requests.get(url, headers={"Accept": "application/vnd.github+json"}, timeout=10)
+        result, tag = "error", None
         if r.status_code == 200:
-            rel = r.json()
-            tag = rel.get("tag_name") or ""
+            from openmower_cli.completion import store_release_tags
+            releases = [rel for rel in r.json() if not rel.get("draft")]
+            store_release_tags(repo, [rel.get("tag_name") for rel in releases if rel.get("tag_name")])
+            stable = [rel for rel in releases if not rel.get("prerelease")]
+            tag = (stable[0].get("tag_name") if stable else "") or ""
+            result = "up_to_date"
             if tag and _is_newer(tag, current_version):
+                result = "update_available"
                 warn(f"A new version {tag} of openmower-cli is available. Run 'openmower self-update' to update.")
         # Regardless of outcome, update timestamp
-        _write_last_check_ts(now)
+        _write_last_check_ts(now, result=result, latest=tag)
     except Exception:
         # On any error, still write timestamp to avoid repeated attempts on every run
-        _write_last_check_ts()
+        _write_last_check_ts(result="error")
         return
 
 
@@ -143,11 +287,35 @@ def fetch_github_release(repo: str, tag: str | None = None) -> dict:
     return r.json()
 
 
-def fetch_github_release_zip(repo: str, expected_asset_suffix: str | None = None, tag: str | None = None) -> tuple[Path, str, tempfile.TemporaryDirectory]:
+def _published_sha256(session: requests.Session, assets: list, asset: dict) -> Optional[str]:
+    """Find the published SHA-256 of an asset: GitHub's asset digest, or a `<name>.sha256` / SHA256SUMS asset."""
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        return digest.split(":", 1)[1].lower()
+    name = asset.get("name", "")
+    for a in assets:
+        if a.get("name") not in (f"{name}.sha256", "SHA256SUMS", "sha256sums.txt"):
+            continue
+        r = session.get(a.get("browser_download_url"), timeout=30)
+        if r.status_code != 200:
+            continue
+        for line in r.text.splitlines():
+            parts = line.split()
+            # `<hex>  <file>` (sha256sum format) or a bare `<hex>` in a per-asset file
+            if parts and (len(parts) == 1 or parts[-1].lstrip("*") == name):
+                return parts[0].lower()
+    return None
+
+
+def fetch_github_release_zip(repo: str, expected_asset_suffix: str | None = None, tag: str | None = None,
+                             tmp_parent: Path | None = None) -> tuple[Path, str, tempfile.TemporaryDirectory]:
     """Download a release asset (.zip) from GitHub to a temporary directory and return (zip_path, tag, tmpdir_handle).
     - repo: 'owner/name'
     - expected_asset_suffix: e.g., '.zip' or a specific name to match; if None, picks first .zip
     - tag: tag name to fetch; if None, fetches latest
+    - tmp_parent: directory to create the temporary directory in (default: system temp dir)
+    - The SHA-256 is computed while downloading and checked against the published digest, if any;
+      a mismatch raises RuntimeError.
     - The returned TemporaryDirectory handle must be kept alive until you're done with files in it,
       and should be explicitly cleaned up; callers should use try/finally to call tmpdir_handle.cleanup().
     """
@@ -173,20 +341,40 @@ def fetch_github_release_zip(repo: str, expected_asset_suffix: str | None = None
     asset_name = asset.get("name")
     download_url = asset.get("browser_download_url")
 
-    td = tempfile.TemporaryDirectory()
+    td = tempfile.TemporaryDirectory(dir=tmp_parent)
     tmpdir = Path(td.name)
     zip_path = tmpdir / asset_name
 
     session = requests.Session()
     session.headers.update({"Accept": "application/octet-stream"})
+    try:
+        expected_sha256 = _published_sha256(session, assets, asset)
+    except requests.RequestException:
+        expected_sha256 = None
+    sha256 = hashlib.sha256()
+    started = time.monotonic()
     with session.get(download_url, stream=True, timeout=300) as resp:
         if resp.status_code != 200:
             # ensure temp dir gets removed even if download fails
             td.cleanup()
+            bump_counters(download_failures_total=1)
             raise RuntimeError(f"Failed to download asset (HTTP {resp.status_code})")
+        total = int(resp.headers.get("Content-Length") or 0) or None
+        done = 0
         with open(zip_path, 'wb') as f:
             for chunk in resp.iter_content(chunk_size=1024 * 256):
                 if chunk:
                     f.write(chunk)
+                    sha256.update(chunk)
+                    done += len(chunk)
+                    progress(f"Downloading {asset_name}", done=done, total=total)
+    bump_counters(downloads_total=1, download_bytes_total=done, download_seconds_total=time.monotonic() - started)
+    if expected_sha256 is None:
+        warn(f"No published SHA-256 for {asset_name}; download integrity not verified.")
+    elif sha256.hexdigest() != expected_sha256:
+        td.cleanup()
+        raise RuntimeError(f"SHA-256 mismatch for {asset_name}: expected {expected_sha256}, got {sha256.hexdigest()}")
+    else:
+        info(f"Verified SHA-256 of {asset_name}: {expected_sha256}")
     # Do not cleanup here; caller will cleanup after using the files
     return zip_path, tag_name, td
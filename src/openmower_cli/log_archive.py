@@ -0,0 +1,379 @@
+import bisect
+import collections
+import gzip
+import json
+import os
+import queue
+import re
+import signal
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from openmower_cli.console import info, warn, error
+
+# Persistent archive of the stack's container logs.
+#
+# The archive directory holds gzip-compressed segment files (`seg-<start ms>.log.gz`) with one
+# `<epoch>\t<service>\t<message>` line per log line, plus an `index.json` recording every closed segment's
+# time range and per-service line counts. The index is only rewritten when segments rotate or expire; the
+# active segment's live metadata and the capture heartbeat go to the small `active.json` instead, so the
+# periodic flush does not rewrite the whole index on the SD card. Queries consult both first and only
+# decompress the segments overlapping the requested window.
+
+INDEX_NAME = "index.json"
+ACTIVE_NAME = "active.json"
+INDEX_VERSION = 1
+
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024  # uncompressed bytes before rotating
+DEFAULT_SEGMENT_SECONDS = 3600
+DEFAULT_KEEP_BYTES = 512 * 1024 * 1024  # compressed bytes kept on disk
+FLUSH_INTERVAL = 5.0
+HEARTBEAT_INTERVAL = 60.0  # how often a running capture records that it is alive, even if the stack is quiet
+RESTART_DELAY = 2.0
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([smhdw])")
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_time_spec(value: str, now: Optional[float] = None) -> float:
+    """Parse a --since/--until value into a unix timestamp.
+
+    Accepts relative durations (`90s`, `10m`, `1h30m`, `2d`), unix timestamps and ISO 8601 date/times.
+    Date/times without a timezone are interpreted as local time.
+    """
+    s = value.strip()
+    now = time.time() if now is None else now
+    if s and _DURATION_RE.sub("", s) == "":
+        total = sum(float(n) * _DURATION_UNITS[u] for n, u in _DURATION_RE.findall(s))
+        return now - total
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    try:
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}. Use a duration (e.g. 10m, 2h), a unix timestamp or an ISO date/time.")
+    return dt.timestamp()
+
+
+def parse_docker_timestamp(ts: str) -> float:
+    """Parse an RFC 3339 timestamp as printed by `docker logs --timestamps` (nanoseconds, `Z` suffix)."""
+    ts = ts.replace("Z", "+00:00")
+    dot = ts.find(".")
+    if dot != -1:
+        # Python < 3.11 only accepts up to microsecond precision
+        end = dot + 1
+        while end < len(ts) and ts[end].isdigit():
+            end += 1
+        ts = ts[:dot] + ts[dot:end][:7] + ts[end:]
+    return datetime.fromisoformat(ts).timestamp()
+
+
+def format_timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def load_index(archive_dir: Path) -> dict:
+    """Load the archive index including the active segment. Returns an empty index if missing or unreadable."""
+    index = _read_json(archive_dir / INDEX_NAME)
+    if index is None or index.get("version") != INDEX_VERSION:
+        index = {"version": INDEX_VERSION, "segments": [], "last_seen": {}}
+    active = _read_json(archive_dir / ACTIVE_NAME) or {}
+    segment = active.get("segment")
+    # The writer persists a rotated segment in the index before clearing it from active.json
+    if segment and all(s["file"] != segment["file"] for s in index["segments"]):
+        index["segments"].append(segment)
+    last_seen = index["last_seen"]
+    for service, ts in (active.get("last_seen") or {}).items():
+        last_seen[service] = max(last_seen.get(service, 0.0), ts)
+    if active.get("updated"):
+        index["updated"] = max(index.get("updated", 0.0), active["updated"])
+    return index
+
+
+def has_archive(archive_dir: Path) -> bool:
+    return (archive_dir / INDEX_NAME).exists() or (archive_dir / ACTIVE_NAME).exists()
+
+
+def coverage(index: dict) -> Tuple[Optional[float], Optional[float]]:
+    """Return the (start, end) of the time range the archive holds, or (None, None) if it is empty.
+
+    The end is the last time the capture was known to be running, not just the newest line.
+    """
+    segments = index["segments"]
+    if not segments:
+        return None, None
+    start = min(s["start"] for s in segments)
+    end = max(max(s["end"] for s in segments), index.get("updated", 0.0))
+    return start, end
+
+
+def covers_until(end: float, until: Optional[float], now: Optional[float] = None) -> bool:
+    """Whether an archive ending at `end` was still being captured at `until` (default: now)."""
+    now = time.time() if now is None else now
+    wanted = now if until is None else min(until, now)
+    return end >= wanted - 2 * HEARTBEAT_INTERVAL
+
+
+class _SegmentWriter:
+    """Appends lines to the active segment, rotating and expiring segments as configured."""
+
+    def __init__(self, archive_dir: Path, segment_bytes: int, segment_seconds: int, keep_bytes: int):
+        self.archive_dir = archive_dir
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.keep_bytes = keep_bytes
+        # Closed segments and last_seen; a segment left active by an interrupted capture counts as closed
+        self.index = load_index(archive_dir)
+        self._fh: Optional[gzip.GzipFile] = None
+        self._entry: Optional[dict] = None
+        self._opened_at = 0.0
+        self._written = 0
+        self._index_dirty = (archive_dir / ACTIVE_NAME).exists()
+        self._live_dirty = False
+
+    def _open_segment(self, ts: float) -> None:
+        name = f"seg-{int(ts * 1000)}.log.gz"
+        self._fh = gzip.open(self.archive_dir / name, "ab")
+        self._entry = {"file": name, "start": ts, "end": ts, "lines": 0, "services": {}}
+        self._live_dirty = True
+        self._opened_at = time.monotonic()
+        self._written = 0
+
+    def _close_segment(self) -> None:
+        if self._fh is None:
+            return
+        self._fh.close()
+        self._fh = None
+        if self._entry["lines"] > 0:
+            self.index["segments"].append(self._entry)
+        else:
+            try:
+                (self.archive_dir / self._entry["file"]).unlink()
+            except FileNotFoundError:
+                pass
+        self._entry = None
+        self._index_dirty = True
+        self._expire()
+        self.flush()
+
+    def _expire(self) -> None:
+        segments = self.index["segments"]
+        sizes = []
+        for seg in segments:
+            try:
+                sizes.append((self.archive_dir / seg["file"]).stat().st_size)
+            except FileNotFoundError:
+                sizes.append(0)
+        total = sum(sizes)
+        while segments and total > self.keep_bytes:
+            seg = segments.pop(0)
+            total -= sizes.pop(0)
+            try:
+                (self.archive_dir / seg["file"]).unlink()
+            except FileNotFoundError:
+                pass
+            self._index_dirty = True
+
+    def write(self, ts: float, service: str, message: str) -> None:
+        if self._fh is not None and (self._written >= self.segment_bytes
+                                     or time.monotonic() - self._opened_at >= self.segment_seconds):
+            self._close_segment()
+        if self._fh is None:
+            self._open_segment(ts)
+        data = f"{ts:.6f}\t{service}\t{message}\n".encode("utf-8", errors="replace")
+        self._fh.write(data)
+        self._written += len(data)
+        entry = self._entry
+        entry["lines"] += 1
+        entry["start"] = min(entry["start"], ts)
+        entry["end"] = max(entry["end"], ts)
+        entry["services"][service] = entry["services"].get(service, 0) + 1
+        last_seen = self.index["last_seen"]
+        last_seen[service] = max(last_seen.get(service, 0.0), ts)
+        self._live_dirty = True
+
+    def touch(self) -> None:
+        """Record that the capture is alive, so readers can tell a quiet stack from a stale archive."""
+        self.index["updated"] = time.time()
+        self._live_dirty = True
+
+    def flush(self) -> None:
+        """Sync-flush the active segment so readers can decode it, then persist what changed.
+
+        The index is only rewritten after rotation or expiry; otherwise just the small active.json is.
+        """
+        if self._fh is not None:
+            self._fh.flush()
+        if self._index_dirty:
+            _write_json(self.archive_dir / INDEX_NAME, self.index)
+        if self._index_dirty or self._live_dirty:
+            _write_json(self.archive_dir / ACTIVE_NAME, {"segment": self._entry, "last_seen": self.index["last_seen"],
+                                                         "updated": self.index.get("updated")})
+        self._index_dirty = self._live_dirty = False
+
+    def close(self) -> None:
+        self._close_segment()
+        self.touch()
+        self.flush()
+
+
+def _follow_service(compose_args: List[str], service: str, since: Optional[float], out: queue.Queue,
+                    stop: threading.Event, procs: Dict[str, subprocess.Popen]) -> None:
+    """Follow one service's logs, restarting `docker compose logs -f` whenever it exits (e.g. container recreated).
+
+    Each run resumes with `--since` at the newest archived timestamp, which docker treats as inclusive. Only
+    lines at or before that resume point are checked against what was already archived; lines sharing a
+    timestamp are otherwise all kept. When resuming a previous capture the messages at `since` are unknown,
+    so lines at exactly `since` are skipped.
+    """
+    last = since
+    at_last: Optional[collections.Counter] = None  # messages archived at timestamp `last`
+    while not stop.is_set():
+        cmd = compose_args + ["logs", "-f", "--timestamps", "--no-color", "--no-log-prefix"]
+        if last is not None:
+            cmd += ["--since", format_timestamp(last)]
+        cmd.append(service)
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                    text=True, errors="replace")
+        except FileNotFoundError as e:
+            error(f"{e}")
+            stop.set()
+            return
+        procs[service] = proc
+        boundary = last
+        seen = collections.Counter(at_last) if at_last is not None else None
+        for line in proc.stdout:
+            stamp, _, message = line.rstrip("\n").partition(" ")
+            try:
+                ts = parse_docker_timestamp(stamp)
+            except ValueError:
+                continue
+            if boundary is not None and ts <= boundary:
+                if ts < boundary or seen is None:
+                    continue
+                if seen[message] > 0:
+                    seen[message] -= 1
+                    continue
+            if last is None or ts > last:
+                last, at_last = ts, collections.Counter()
+            if ts == last:
+                at_last[message] += 1
+            out.put((ts, service, message))
+        proc.wait()
+        stop.wait(RESTART_DELAY)
+
+
+def capture(compose_args: List[str], services: List[str], archive_dir: Path,
+            segment_bytes: int = DEFAULT_SEGMENT_BYTES, segment_seconds: int = DEFAULT_SEGMENT_SECONDS,
+            keep_bytes: int = DEFAULT_KEEP_BYTES) -> int:
+    """Continuously tail the given services into the archive until interrupted.
+
+    Resumes each service where the previous capture left off. Returns the exit code (0 for Ctrl-C).
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    writer = _SegmentWriter(archive_dir, segment_bytes, segment_seconds, keep_bytes)
+    lines: queue.Queue = queue.Queue(maxsize=10000)
+    stop = threading.Event()
+    procs: Dict[str, subprocess.Popen] = {}
+
+    def _handle_sigint(signum, frame):
+        info("Interrupt received! Stopping...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, _handle_sigint)
+    signal.signal(signal.SIGTERM, _handle_sigint)
+
+    threads = []
+    for svc in services:
+        t = threading.Thread(target=_follow_service,
+                             args=(compose_args, svc, writer.index["last_seen"].get(svc), lines, stop, procs),
+                             daemon=True)
+        t.start()
+        threads.append(t)
+
+    info(f"Capturing logs of {', '.join(services)} into {archive_dir} ...")
+    next_flush = time.monotonic() + FLUSH_INTERVAL
+    next_heartbeat = time.monotonic()
+    try:
+        while not stop.is_set() or not lines.empty():
+            try:
+                ts, svc, message = lines.get(timeout=0.5)
+                writer.write(ts, svc, message)
+            except queue.Empty:
+                pass
+            if time.monotonic() >= next_heartbeat:
+                writer.touch()
+                next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+            if time.monotonic() >= next_flush:
+                writer.flush()
+                next_flush = time.monotonic() + FLUSH_INTERVAL
+            if stop.is_set():
+                for proc in procs.values():
+                    if proc.poll() is None:
+                        proc.terminate()
+    finally:
+        stop.set()
+        for proc in procs.values():
+            if proc.poll() is None:
+                proc.terminate()
+        writer.close()
+    return 0
+
+
+def _read_segment(path: Path) -> Iterator[Tuple[float, str, str]]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                ts, _, rest = line.partition("\t")
+                service, _, message = rest.partition("\t")
+                yield float(ts), service, message.rstrip("\n")
+    except (EOFError, gzip.BadGzipFile):
+        # The active segment has no end-of-stream marker yet; everything up to the last flush is readable.
+        return
+    except FileNotFoundError:
+        warn(f"Archived log segment {path.name} disappeared (expired?); skipping.")
+
+
+def query(archive_dir: Path, since: Optional[float] = None, until: Optional[float] = None,
+          services: Optional[List[str]] = None) -> Iterator[Tuple[float, str, str]]:
+    """Yield archived (timestamp, service, message) lines within [since, until] for the given services."""
+    segments = sorted(load_index(archive_dir)["segments"], key=lambda s: s["start"])
+    # Segments starting after `until` can never match
+    if until is not None:
+        segments = segments[:bisect.bisect_right([s["start"] for s in segments], until)]
+    wanted = set(services) if services else None
+    for seg in segments:
+        if since is not None and seg["end"] < since:
+            continue
+        if wanted is not None and wanted.isdisjoint(seg["services"]):
+            continue
+        for ts, service, message in _read_segment(archive_dir / seg["file"]):
+            if since is not None and ts < since:
+                continue
+            if until is not None and ts > until:
+                continue
+            if wanted is not None and service not in wanted:
+                continue
+            yield ts, service, message
@@ -0,0 +1,235 @@
+import os
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from openmower_cli import __version__
+from openmower_cli.constants import CACHE_DIR, LOG_ARCHIVE_DIR, XESC_STATS_DIR
+from openmower_cli.helpers import load_state, read_last_check, compose_project_name
+
+# Prometheus text format exporter for the CLI's view of the stack.
+#
+# Everything is read from cheap local sources: one `containers?all=1` docker API call per scrape
+# (full inspects only for containers that are new, changed state or whose cached inspect is stale),
+# small JSON state files and the memory-mapped `expose-xesc` counters.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+INSPECT_TTL = 60.0
+CACHE_SIZE_TTL = 60.0
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+
+Labels = Dict[str, str]
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Exposition:
+    def __init__(self):
+        self._lines: List[str] = []
+
+    def add(self, name: str, kind: str, help_: str, samples: List[Tuple[Labels, float]]) -> None:
+        if not samples:
+            return
+        self._lines.append(f"# HELP {name} {help_}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            self._lines.append(f"{name}{{{label_str}}} {_format_value(value)}" if label_str
+                               else f"{name} {_format_value(value)}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def _iso_to_ts(value: Optional[str]) -> Optional[float]:
+    if not value or value.startswith("0001-"):
+        return None
+    try:
+        from openmower_cli.log_archive import parse_docker_timestamp
+        return parse_docker_timestamp(value)
+    except ValueError:
+        return None
+
+
+class MetricsCollector:
+    """Collects metrics on demand, caching what is expensive to fetch between scrapes."""
+
+    def __init__(self, project: Optional[str] = None):
+        self._project = project  # resolved from the compose file on first use
+        self._api = None
+        self._inspect: Dict[str, Tuple[str, float, dict]] = {}  # id -> (state, fetched at, inspect subset)
+        self._cache_size: Optional[Tuple[float, int, int]] = None  # (computed at, bytes, files)
+
+    def _docker_api(self):
+        if self._api is None:
+            import docker
+            self._api = docker.from_env().api
+        return self._api
+
+    def _containers(self, out: _Exposition) -> None:
+        if self._project is None:
+            self._project = compose_project_name()
+        try:
+            api = self._docker_api()
+            containers = api.containers(all=True, filters={"label": f"{PROJECT_LABEL}={self._project}"})
+        except Exception:
+            self._api = None
+            out.add("openmower_docker_up", "gauge", "Whether the docker API was reachable.", [({}, 0)])
+            return
+        out.add("openmower_docker_up", "gauge", "Whether the docker API was reachable.", [({}, 1)])
+
+        now = time.monotonic()
+        up, state, restarts, started = [], [], [], []
+        seen = set()
+        for c in containers:
+            cid = c["Id"]
+            seen.add(cid)
+            cached = self._inspect.get(cid)
+            if cached is None or cached[0] != c.get("State") or now - cached[1] > INSPECT_TTL:
+                try:
+                    attrs = api.inspect_container(cid)
+                    cached = (c.get("State"), now, {"RestartCount": attrs.get("RestartCount", 0),
+                                                    "StartedAt": (attrs.get("State") or {}).get("StartedAt")})
+                    self._inspect[cid] = cached
+                except Exception:
+                    cached = (c.get("State"), now, {"RestartCount": 0, "StartedAt": None})
+            labels = {"service": (c.get("Labels") or {}).get(SERVICE_LABEL, ""),
+                      "container": (c.get("Names") or [cid[:12]])[0].lstrip("/")}
+            up.append((labels, 1 if c.get("State") == "running" else 0))
+            state.append(({**labels, "state": c.get("State", "unknown")}, 1))
+            restarts.append((labels, cached[2]["RestartCount"]))
+            ts = _iso_to_ts(cached[2]["StartedAt"])
+            if ts is not None:
+                started.append((labels, ts))
+        for cid in list(self._inspect):
+            if cid not in seen:
+                del self._inspect[cid]
+
+        out.add("openmower_container_up", "gauge", "Whether the container is running.", up)
+        out.add("openmower_container_state", "gauge", "Current container state (value is always 1).", state)
+        out.add("openmower_container_restarts_total", "counter", "Restarts of the container by docker.", restarts)
+        out.add("openmower_container_started_timestamp_seconds", "gauge", "When the container was last started.", started)
+
+    def _updates(self, out: _Exposition) -> None:
+        check = read_last_check()
+        if check.get("last_check"):
+            try:
+                ts = datetime.fromisoformat(check["last_check"]).timestamp()
+                out.add("openmower_update_check_timestamp_seconds", "gauge", "Time of the last CLI update check.", [({}, ts)])
+            except ValueError:
+                pass
+            if check.get("result"):
+                out.add("openmower_update_check_result", "gauge", "Result of the last CLI update check.",
+                        [({"result": check["result"], "latest": check.get("latest") or ""}, 1)])
+
+        state = load_state()
+        flash = state.get("firmware_flash")
+        if flash:
+            labels = {"target": str(flash.get("target", "")), "release": str(flash.get("release") or "")}
+            out.add("openmower_firmware_flash_timestamp_seconds", "gauge", "Time of the last firmware flash.",
+                    [(labels, flash.get("ts", 0))])
+            out.add("openmower_firmware_flash_success", "gauge", "Whether the last firmware flash succeeded.",
+                    [(labels, 1 if flash.get("ok") else 0)])
+
+        counters = state.get("counters", {})
+        for name, help_ in (("downloads_total", "Completed release/firmware downloads."),
+                            ("download_failures_total", "Failed release/firmware downloads."),
+                            ("download_bytes_total", "Bytes downloaded."),
+                            ("download_seconds_total", "Time spent downloading."),
+                            ("cache_hits_total", "Lookups answered from the local cache."),
+                            ("cache_misses_total", "Lookups that missed the local cache.")):
+            out.add(f"openmower_{name}", "counter", help_, [({}, counters.get(name, 0))])
+
+    def _caches(self, out: _Exposition) -> None:
+        now = time.monotonic()
+        if self._cache_size is None or now - self._cache_size[0] > CACHE_SIZE_TTL:
+            size = files = 0
+            for root, _, names in os.walk(CACHE_DIR):
+                for n in names:
+                    try:
+                        size += os.stat(os.path.join(root, n)).st_size
+                        files += 1
+                    except OSError:
+                        pass
+            self._cache_size = (now, size, files)
+        out.add("openmower_cache_bytes", "gauge", "Size of the CLI cache directory.", [({}, self._cache_size[1])])
+        out.add("openmower_cache_files", "gauge", "Files in the CLI cache directory.", [({}, self._cache_size[2])])
+
+        from openmower_cli.log_archive import has_archive, load_index
+        if has_archive(LOG_ARCHIVE_DIR):
+            segments = load_index(LOG_ARCHIVE_DIR)["segments"]
+            out.add("openmower_log_archive_segments", "gauge", "Segments in the log archive.", [({}, len(segments))])
+            if segments:
+                out.add("openmower_log_archive_newest_timestamp_seconds", "gauge", "Newest archived log line.",
+                        [({}, max(s["end"] for s in segments))])
+
+    def _xesc(self, out: _Exposition) -> None:
+        from openmower_cli.serial_capture import read_bridge_counters
+        counters = read_bridge_counters(Path(XESC_STATS_DIR))
+        if not counters:
+            return
+        # Plain socat bridges do not see the traffic; only relayed bridges (--relay/--capture) report bytes and clients
+        relayed = {d: c for d, c in counters.items() if c["counts_bytes"]}
+        out.add("openmower_xesc_bytes_total", "counter", "Bytes forwarded by expose-xesc --relay/--capture.",
+                [({"device": d, "direction": "from_device"}, c["bytes_from_device"]) for d, c in relayed.items()]
+                + [({"device": d, "direction": "to_device"}, c["bytes_to_device"]) for d, c in relayed.items()])
+        out.add("openmower_xesc_errors_total", "counter", "Forwarding errors and failed socat runs.",
+                [({"device": d}, c["errors"]) for d, c in counters.items()])
+        out.add("openmower_xesc_restarts_total", "counter", "Restarts of the device side of the bridge.",
+                [({"device": d}, c["restarts"]) for d, c in counters.items()])
+        out.add("openmower_xesc_clients_total", "counter", "TCP clients accepted by expose-xesc --relay/--capture.",
+                [({"device": d}, c["clients"]) for d, c in relayed.items()])
+        out.add("openmower_xesc_last_update_timestamp_seconds", "gauge", "Last time the bridge updated its counters.",
+                [({"device": d}, c["updated"]) for d, c in counters.items()])
+
+    def collect(self) -> str:
+        out = _Exposition()
+        out.add("openmower_cli_info", "gauge", "openmower-cli version.", [({"version": __version__}, 1)])
+        self._containers(out)
+        self._updates(out)
+        self._caches(out)
+        self._xesc(out)
+        return out.render()
+
+
+def write_textfile(collector: MetricsCollector, path: Path) -> None:
+    """Write metrics atomically for node_exporter's textfile collector."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(collector.collect())
+    os.replace(tmp, path)
+
+
+def serve(collector: MetricsCollector, host: str, port: int) -> None:
+    """Serve /metrics until interrupted. Single-threaded: scrapes are serialized, so the collector needs no locking."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_response(302)
+                self.send_header("Location", "/metrics")
+                self.end_headers()
+                return
+            body = collector.collect().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with HTTPServer((host, port), _Handler) as httpd:
+        httpd.serve_forever()
@@ -1,33 +1,49 @@
 import os
+import tempfile
 import zipfile
+from pathlib import Path
 
 import typer
 
-from openmower_cli.console import info, error, success
-from openmower_cli.helpers import fetch_github_release_zip, run
+from openmower_cli.console import info, warn, error, success
+from openmower_cli.helpers import fetch_github_release_zip, run, record_state
 
 openmower_app = typer.Typer(help="OpenMower Commands")
 
 
-@openmower_app.command()
-def update_firmware():
-    """Update mower firmware to the latest release from fw-openmower-v2.
+def _fetch_firmware_ranged(mower: str) -> tuple[Path, str, tempfile.TemporaryDirectory] | None:
+    """Validate MOWER against the release's table of contents and fetch only its firmware via range requests.
 
-    Steps:
-    - Check MOWER env variable is set
-    - Download latest firmware release zip from GitHub
-    - Extract into a temp folder and locate MOWER/firmware.bin
-    - Upload via docker to the mower's xcore boot tool
+    Returns None if the catalog cannot be used (e.g. no range support), so the caller can download the archive.
     """
-    mower = os.environ.get("MOWER")
-    if not mower:
-        error("Environment variable MOWER is not set. Please set MOWER to your mower identifier and retry.")
-        raise typer.Exit(code=2)
+    from openmower_cli.firmware_catalog import V2_SOURCE, catalog, fetch_variant
+    try:
+        tag, asset, found = catalog(V2_SOURCE)
+    except Exception as e:
+        warn(f"Could not read the firmware catalog ({e}); downloading the full release archive.")
+        return None
+    if mower not in found:
+        error(f"Firmware for MOWER={mower} not found in release {tag}. Available: {', '.join(found) or 'none'}. Your MOWER environment variable may be set incorrectly.")
+        raise typer.Exit(code=1)
 
-    from openmower_cli.constants import FW_REPO
-    repo = FW_REPO
+    td = tempfile.TemporaryDirectory()
+    fw_path = Path(td.name) / f"openmower-{mower}.bin"
+    try:
+        fetch_variant(asset, found[mower], fw_path)
+    except Exception as e:
+        td.cleanup()
+        warn(f"Ranged firmware download failed ({e}); downloading the full release archive.")
+        return None
+    info(f"Downloaded {fw_path.name} from release {tag}")
+    return fw_path, tag, td
+
+
+def _fetch_firmware(repo: str, mower: str) -> tuple[Path, str, tempfile.TemporaryDirectory]:
+    """Return (firmware path, tag, tmpdir handle); the caller must clean up the handle."""
+    fetched = _fetch_firmware_ranged(mower)
+    if fetched is not None:
+        return fetched
 
-    info("Fetching latest firmware release from GitHub ...")
     try:
         zip_path, tag, tmp_handle = fetch_github_release_zip(repo, expected_asset_suffix=None, tag=None)
     except Exception as e:
@@ -49,7 +65,33 @@ def update_firmware():
         if not fw_path.exists() or not fw_path.is_file():
             error(f"Firmware file not found at expected path: {fw_path}. Please ensure the release contains openmower-{mower}.bin. Your MOWER environment variable may be set incorrectly.")
             raise typer.Exit(code=1)
+    except typer.Exit:
+        tmp_handle.cleanup()
+        raise
+    return fw_path, tag, tmp_handle
 
+
+@openmower_app.command()
+def update_firmware():
+    """Update mower firmware to the latest release from fw-openmower-v2.
+
+    Steps:
+    - Check MOWER env variable is set
+    - Validate MOWER against the latest release's table of contents and fetch only openmower-MOWER.bin
+      via HTTP range requests (falls back to downloading and extracting the whole release zip)
+    - Upload via docker to the mower's xcore boot tool
+    """
+    mower = os.environ.get("MOWER")
+    if not mower:
+        error("Environment variable MOWER is not set. Please set MOWER to your mower identifier and retry.")
+        raise typer.Exit(code=2)
+
+    from openmower_cli.constants import FW_REPO
+    repo = FW_REPO
+
+    info("Fetching latest firmware release from GitHub ...")
+    fw_path, tag, tmp_handle = _fetch_firmware(repo, mower)
+    try:
         # Run docker uploader
         info("Uploading firmware to mower via docker ...")
         # Fetch the latest docker image
@@ -72,8 +114,10 @@ def update_firmware():
         except typer.Exit:
             # run already emitted messages; re-raise
             error("Error uploading firmware.")
+            record_state("firmware_flash", ok=False, release=tag, target=mower)
             raise
 
+        record_state("firmware_flash", ok=True, release=tag, target=mower)
         success(f"Firmware upload finished (release {tag or 'latest'}).")
     finally:
         # Ensure temporary download directory is removed
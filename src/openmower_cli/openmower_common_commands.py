@@ -1,5 +1,6 @@
 import subprocess
 import sys
+import time
 import os
 import platform
 import stat
@@ -11,13 +12,14 @@ from typing import List, Optional
 import requests
 import hashlib
 
-from openmower_cli.console import info, warn, error, success
-from openmower_cli.helpers import run
+from openmower_cli.console import info, warn, error, success, event, json_mode, set_output_mode
+from openmower_cli.helpers import run, run_parallel, env_bool, compose_project_name, human_bytes
 import typer
 
 openmower_common_app = typer.Typer(help="OpenMower (Legacy) Commands", no_args_is_help=True)
 
-from openmower_cli.constants import DEFAULT_GH_REPO, COMPOSE_FILE, DOCKER_BIN, DEFAULT_SERVICE, STACK_NAME, ENV_PATH
+from openmower_cli.constants import DEFAULT_GH_REPO, COMPOSE_FILE, DOCKER_BIN, DEFAULT_SERVICE, STACK_NAME, ENV_PATH, \
+    LOG_ARCHIVE_DIR, METRICS_PORT
 
 
 def _compose_base_args() -> List[str]:
@@ -25,6 +27,19 @@ def _compose_base_args() -> List[str]:
     return [DOCKER_BIN, "compose", "-f", COMPOSE_FILE]
 
 
+def _compose_services(running: bool = False) -> List[str]:
+    """List the services defined in the compose file (docker compose config --services), or only the running ones."""
+    sub = ["ps", "--services", "--status", "running"] if running else ["config", "--services"]
+    try:
+        proc = subprocess.run(_compose_base_args() + sub, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        error(f"{e}")
+        raise typer.Exit(code=127)
+    if proc.returncode != 0:
+        error(f"Failed to list compose services: {proc.stderr.strip()}")
+        raise typer.Exit(code=proc.returncode)
+    return [s for s in proc.stdout.split() if s]
+
 
 @openmower_common_app.command()
 def pull():
@@ -65,22 +80,94 @@ def status_cmd():
 
 @openmower_common_app.command("logs")
 def logs_cmd(
-        services: List[str] = typer.Argument(None, help="Optional service names to filter logs", show_default=False)):
-    """Tail container logs. Defaults to -f --tail 100 when no service provided."""
+        services: List[str] = typer.Argument(None, help="Optional service names to filter logs", show_default=False),
+        since: Optional[str] = typer.Option(None, "--since", help="Show logs since a time (e.g. 10m, 2h, 2024-05-01T14:00)."),
+        until: Optional[str] = typer.Option(None, "--until", help="Show logs until a time (e.g. 5m, 2024-05-01T14:05)."),
+        archive: bool = typer.Option(True, "--archive/--no-archive", help="Answer --since/--until from the log archive if one was captured."),
+):
+    """Tail container logs. Defaults to -f --tail 100 when no service provided.
+
+    With --since/--until and an archive written by `logs-capture`, only the archive segments overlapping
+    the requested window are read, so history survives container recreation.
+    """
+    from openmower_cli import log_archive
+
+    try:
+        since_ts = log_archive.parse_time_spec(since) if since else None
+        until_ts = log_archive.parse_time_spec(until) if until else None
+    except ValueError as e:
+        error(str(e))
+        raise typer.Exit(code=2)
+
+    if (since or until) and archive and log_archive.has_archive(LOG_ARCHIVE_DIR):
+        start, end = log_archive.coverage(log_archive.load_index(LOG_ARCHIVE_DIR))
+        if start is None:
+            warn("Log archive is empty; asking docker instead.")
+        elif not log_archive.covers_until(end, until_ts):
+            warn(f"Log archive ends at {log_archive.format_timestamp(end)} (is logs-capture running?); "
+                 f"asking docker instead.")
+        else:
+            if since_ts is not None and since_ts < start:
+                warn(f"Log archive starts at {log_archive.format_timestamp(start)}; earlier lines are not included.")
+            lines = log_archive.query(LOG_ARCHIVE_DIR, since_ts, until_ts, services or None)
+            if json_mode():
+                for ts, svc, message in lines:
+                    event("log", time=ts, service=svc, message=message)
+                return
+            out = sys.stdout
+            for ts, svc, message in lines:
+                out.write(f"{svc} | {log_archive.format_timestamp(ts)} {message}\n")
+            out.flush()
+            return
+
+    # Pass docker RFC 3339 timestamps so both paths accept the same --since/--until syntax
     args = _compose_base_args() + ["logs"]
+    if since_ts is not None:
+        args += ["--since", log_archive.format_timestamp(since_ts)]
+    if until_ts is not None:
+        args += ["--until", log_archive.format_timestamp(until_ts)]
     if not services:
-        args += ["-f", "--tail", "100"]
+        if not (since or until):
+            args += ["-f", "--tail", "100"]
     else:
         args += services
     run(args)
 
 
-@openmower_common_app.command("shell", context_settings={"allow_extra_args": True, "ignore_unknown_options": True},
+@openmower_common_app.command("logs-capture")
+def logs_capture_cmd(
+        services: List[str] = typer.Argument(None, help="Services to capture (default: all services in the compose file)", show_default=False),
+        segment_size: int = typer.Option(8, "--segment-size", help="Rotate segments after this many MiB of uncompressed log."),
+        segment_age: int = typer.Option(60, "--segment-age", help="Rotate segments after this many minutes."),
+        keep: int = typer.Option(512, "--keep", help="Keep at most this many MiB of compressed segments."),
+):
+    """Continuously archive stack logs into rotating, compressed, time-indexed segments.
+
+    Run it as a long-lived service; `openmower logs --since/--until` then answers from the archive.
+    """
+    from openmower_cli import log_archive
+
+    code = log_archive.capture(
+        _compose_base_args(),
+        services or _compose_services(),
+        LOG_ARCHIVE_DIR,
+        segment_bytes=segment_size * 1024 * 1024,
+        segment_seconds=segment_age * 60,
+        keep_bytes=keep * 1024 * 1024,
+    )
+    raise typer.Exit(code=code)
+
+
+@openmower_common_app.command("shell", context_settings={"allow_extra_args": True, "ignore_unknown_options": True,
+                                                         "allow_interspersed_args": False},
                               help="Open an interactive shell inside the running container or execute a command.")
-@openmower_common_app.command("exec", context_settings={"allow_extra_args": True, "ignore_unknown_options": True},
+@openmower_common_app.command("exec", context_settings={"allow_extra_args": True, "ignore_unknown_options": True,
+                                                        "allow_interspersed_args": False},
                               help="Open an interactive shell inside the running container or execute a command.")
 def shell_cmd(
-        ctx: typer.Context
+        ctx: typer.Context,
+        all_services: bool = typer.Option(False, "--all", help="Run the command in every running service in parallel."),
+        services: Optional[str] = typer.Option(None, "--services", help="Comma separated services to run the command in, in parallel."),
 ):
     """
     Open an interactive shell inside the running container or execute a command.
@@ -89,7 +176,30 @@ def shell_cmd(
     - Default service is 'openmower'.
     - If a command is provided, run it via `docker compose exec <svc> <cmd ...>`.
     - If no command is provided, run an interactive login shell with env hints.
+
+    With --all or --services, every argument is the command; it runs concurrently in each selected service
+    and output is prefixed with the service name.
     """
+    if all_services or services:
+        if not ctx.args:
+            error("A command is required with --all/--services.")
+            raise typer.Exit(code=2)
+        targets = _compose_services(running=True) if all_services else [s for s in services.split(",") if s]
+        if not targets:
+            error("No running services found.")
+            raise typer.Exit(code=1)
+        info(f"Running `{' '.join(ctx.args)}` in {', '.join(targets)}")
+        codes = run_parallel({svc: _compose_base_args() + ["exec", "-T", svc] + ctx.args for svc in targets})
+        failed = {svc: code for svc, code in codes.items() if code != 0}
+        for svc, code in codes.items():
+            if code == 0:
+                success(f"{svc}: exit 0")
+            else:
+                error(f"{svc}: exit {code}")
+        if failed:
+            raise typer.Exit(code=max(failed.values()))
+        return
+
     service = DEFAULT_SERVICE if len(ctx.args) == 0 else ctx.args[0]
     cmd = ctx.args[1:] if len(ctx.args) > 1 else None
 
@@ -109,6 +219,200 @@ def shell_cmd(
     run(args)
 
 
+@openmower_common_app.command("top")
+def top_cmd(
+        interval: float = typer.Option(2.0, "--interval", "-n", help="Seconds between table redraws / samples."),
+        sample: Optional[int] = typer.Option(None, "--sample", help="Headless: take this many samples and exit."),
+        as_json: bool = typer.Option(False, "--json", help="Emit samples as NDJSON events (implies headless)."),
+):
+    """Live CPU, memory, network and block I/O of the stack's containers (like docker stats, per service)."""
+    try:
+        import docker
+    except ImportError:
+        error("The 'docker' Python package is required for this command.")
+        raise typer.Exit(code=1)
+    from openmower_cli.stack_stats import StackStatsCollector
+
+    project = compose_project_name()
+    try:
+        collector = StackStatsCollector(docker.from_env(), project)
+        collector.start()
+    except Exception as e:
+        error(f"Failed to connect to docker: {e}")
+        raise typer.Exit(code=1)
+
+    if as_json:
+        set_output_mode("json")
+    if as_json or json_mode() or sample is not None:
+        count = sample if sample is not None else 1
+        try:
+            for i in range(count):
+                # Streams deliver roughly once per second; the first samples need two readings for rates
+                time.sleep(interval)
+                rows = collector.snapshot()
+                if json_mode():
+                    event("stats", flush=True, sample=i, containers=rows)
+                else:
+                    for r in rows:
+                        typer.echo(f"{i}\t{r['service']}\t{r['cpu_percent']:.1f}%\t{human_bytes(r['mem_bytes'])}\t"
+                                   f"{human_bytes(r['net_rx_rate'])}/s\t{human_bytes(r['net_tx_rate'])}/s\t"
+                                   f"{human_bytes(r['blk_read_rate'])}/s\t{human_bytes(r['blk_write_rate'])}/s")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            collector.stop()
+        return
+
+    from rich.live import Live
+    from rich.table import Table
+
+    def _render() -> Table:
+        table = Table(title=f"{project} ({time.strftime('%H:%M:%S')})", box=None, pad_edge=False)
+        for col in ("SERVICE", "CPU %", "MEM", "NET RX/s", "NET TX/s", "BLK R/s", "BLK W/s", "PIDS"):
+            table.add_column(col, justify="left" if col == "SERVICE" else "right")
+        for r in collector.snapshot():
+            mem = human_bytes(r["mem_bytes"])
+            if r["mem_limit"]:
+                mem += f" ({r['mem_bytes'] / r['mem_limit'] * 100:.0f}%)"
+            table.add_row(r["service"], f"{r['cpu_percent']:.1f}", mem,
+                          human_bytes(r["net_rx_rate"]), human_bytes(r["net_tx_rate"]),
+                          human_bytes(r["blk_read_rate"]), human_bytes(r["blk_write_rate"]), str(r["pids"]))
+        return table
+
+    try:
+        # Redraw only on our own schedule, independent of how often the streams update
+        with Live(_render(), auto_refresh=False) as live:
+            while True:
+                time.sleep(interval)
+                live.update(_render(), refresh=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+
+
+metrics_app = typer.Typer(help="Prometheus metrics for the stack, updates and serial bridges.")
+openmower_common_app.add_typer(metrics_app, name="metrics")
+
+
+@metrics_app.callback(invoke_without_command=True)
+def metrics_cmd(
+        ctx: typer.Context,
+        textfile: Optional[Path] = typer.Option(None, "--textfile", help="Write metrics once to this file (node_exporter textfile collector) and exit."),
+):
+    """Print metrics once in Prometheus text format, or write them to --textfile.
+
+    In JSON output mode the exposition text is returned in the `metrics` field of a result event.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+    from openmower_cli.metrics import MetricsCollector, write_textfile
+
+    collector = MetricsCollector()
+    if textfile is None:
+        if json_mode():
+            event("result", ok=True, format="prometheus", metrics=collector.collect())
+        else:
+            sys.stdout.write(collector.collect())
+        return
+    try:
+        write_textfile(collector, textfile)
+    except OSError as e:
+        error(f"Failed to write {textfile}: {e}")
+        raise typer.Exit(code=1)
+
+
+@metrics_app.command("serve")
+def metrics_serve(
+        port: int = typer.Option(METRICS_PORT, "--port", "-p", help="Port to serve /metrics on."),
+        listen: str = typer.Option("0.0.0.0", "--listen", help="Address to bind to."),
+):
+    """Serve metrics over HTTP for Prometheus to scrape."""
+    from openmower_cli.metrics import MetricsCollector, serve
+
+    info(f"Serving metrics on http://{listen}:{port}/metrics")
+    try:
+        serve(MetricsCollector(), listen, port)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        error(f"Failed to serve metrics: {e}")
+        raise typer.Exit(code=1)
+
+
+firmware_app = typer.Typer(help="List and fetch firmware variants of a release without downloading the whole archive.")
+openmower_common_app.add_typer(firmware_app, name="firmware")
+
+
+def _firmware_source(legacy: Optional[bool]):
+    from openmower_cli.firmware_catalog import LEGACY_SOURCE, V2_SOURCE
+    if legacy is None:
+        legacy = not env_bool("V2_HARDWARE")
+    return LEGACY_SOURCE if legacy else V2_SOURCE
+
+
+def _firmware_catalog(source, tag: Optional[str], refresh: bool):
+    from openmower_cli.firmware_catalog import catalog
+    try:
+        return catalog(source, tag, refresh)
+    except Exception as e:
+        error(f"Failed to read firmware catalog of {source.repo}: {e}")
+        raise typer.Exit(code=1)
+
+
+@firmware_app.command("list")
+def firmware_list(
+        tag: Optional[str] = typer.Option(None, "--tag", "-t", help="Release tag (default: the latest release)."),
+        legacy: Optional[bool] = typer.Option(None, "--legacy/--v2", help="Firmware generation (default: from V2_HARDWARE)."),
+        refresh: bool = typer.Option(False, "--refresh", help="Re-read the archive's table of contents instead of using the cache."),
+):
+    """List the firmware variants (MOWER / OM_HARDWARE_VERSION values) contained in a release."""
+    source = _firmware_source(legacy)
+    tag_name, asset, found = _firmware_catalog(source, tag, refresh)
+    configured = os.environ.get(source.env_var)
+    if json_mode():
+        event("result", flush=True, ok=True, repo=source.repo, release=tag_name, asset=asset.get("name"),
+              configured=configured, variants=[{"name": v, "member": e["name"], "size": e["size"]} for v, e in found.items()])
+    else:
+        info(f"Firmware variants in {source.repo} {tag_name} ({asset.get('name')}):")
+        for v, e in found.items():
+            marker = "*" if v == configured else " "
+            typer.echo(f"{marker} {v:<24} {human_bytes(e['size']):>10}")
+    if configured and configured not in found:
+        warn(f"{source.env_var}={configured} is not available in this release.")
+
+
+@firmware_app.command("fetch")
+def firmware_fetch(
+        variant: Optional[str] = typer.Argument(None, help="Variant to fetch (default: $MOWER or $OM_HARDWARE_VERSION)."),
+        dest: Optional[Path] = typer.Option(None, "--dest", "-d", help="Output file (default: the member's file name in the current directory)."),
+        tag: Optional[str] = typer.Option(None, "--tag", "-t", help="Release tag (default: the latest release)."),
+        legacy: Optional[bool] = typer.Option(None, "--legacy/--v2", help="Firmware generation (default: from V2_HARDWARE)."),
+        refresh: bool = typer.Option(False, "--refresh", help="Re-read the archive's table of contents instead of using the cache."),
+):
+    """Download a single firmware variant from a release zip using HTTP range requests."""
+    from openmower_cli.firmware_catalog import fetch_variant
+
+    source = _firmware_source(legacy)
+    variant = variant or os.environ.get(source.env_var)
+    if not variant:
+        error(f"No variant given and {source.env_var} is not set.")
+        raise typer.Exit(code=2)
+    tag_name, asset, found = _firmware_catalog(source, tag, refresh)
+    entry = found.get(variant)
+    if entry is None:
+        error(f"Firmware variant '{variant}' not found in {tag_name}. Available: {', '.join(found) or 'none'}.")
+        raise typer.Exit(code=2)
+    dest = dest or Path(Path(entry["name"]).name if source.name == "v2" else f"firmware-{variant}.elf")
+    info(f"Fetching {entry['name']} from {asset.get('name')} ({tag_name}) ...")
+    try:
+        fetch_variant(asset, entry, dest)
+    except Exception as e:
+        error(f"Failed to fetch {entry['name']}: {e}")
+        raise typer.Exit(code=1)
+    success(f"Saved {variant} firmware to {dest}.")
+
+
 @openmower_common_app.command("configure")
 def configure():
     """Open the stack .env in nano and restart the docker stack if changes were made."""
@@ -156,16 +460,104 @@ def configure():
         info("No changes detected in .env. Stack not restarted.")
 
 
+def _kernel_copy(src: Path, dst: Path) -> None:
+    """Copy a file without pulling its bytes through Python: copy_file_range, then sendfile, then a plain copy."""
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        for fn in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+            if fn is None:
+                continue
+            try:
+                while remaining > 0:
+                    if fn is os.sendfile:
+                        n = os.sendfile(fdst.fileno(), fsrc.fileno(), None, remaining)
+                    else:
+                        n = fn(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                if remaining == 0:
+                    return
+            except OSError:
+                # e.g. EXDEV/EINVAL for unsupported file systems; retry with the next method from the current offset
+                pass
+        # Continue at the fd offsets left by a partial kernel copy
+        while True:
+            chunk = os.read(fsrc.fileno(), 1024 * 1024)
+            if not chunk:
+                break
+            fdst.write(chunk)
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _stage_next_to(src: Path, target: Path) -> Path:
+    """Place `src` at `<target>.tmp`, renaming if on the same file system, and make it durable."""
+    tmp_target = target.with_name(target.name + ".tmp")
+    if os.stat(src).st_dev == os.stat(target.parent).st_dev:
+        os.replace(src, tmp_target)
+    else:
+        _kernel_copy(src, tmp_target)
+    st = os.stat(tmp_target)
+    os.chmod(tmp_target, st.st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    _fsync_path(tmp_target)
+    return tmp_target
+
+
+def _snapshot(path: Path, dest: Path) -> None:
+    """Atomically make `dest` a copy of `path`, using a hard link when possible."""
+    tmp = dest.with_name(dest.name + ".tmp")
+    try:
+        tmp.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(path, tmp)
+    except OSError:
+        _kernel_copy(path, tmp)
+        os.chmod(tmp, os.stat(path).st_mode)
+        _fsync_path(tmp)
+    os.replace(tmp, dest)
+
+
+def _rollback(exe_path: Path) -> None:
+    """Swap the current executable with the one kept by the last self-update."""
+    prev = exe_path.with_name(exe_path.name + ".prev")
+    if not prev.exists():
+        error(f"No previous version to roll back to ({prev} not found).")
+        raise typer.Exit(code=1)
+    info(f"Rolling back {exe_path} to the previous version ...")
+    try:
+        # Keep the current version as .prev, so a rollback can be undone with another rollback
+        current = exe_path.with_name(exe_path.name + ".rollback")
+        _snapshot(exe_path, current)
+        os.replace(prev, exe_path)
+        os.replace(current, prev)
+        _fsync_path(exe_path.parent)
+    except PermissionError as e:
+        error(f"Failed to roll back executable at: {e}.")
+        raise typer.Exit(code=1)
+    success("Rolled back successfully. Please re-run the command.")
+
+
 @openmower_common_app.command("self-update")
 def self_update(
     version: Optional[str] = typer.Option(None, "--version", "-v", help="Update to a specific tag (e.g., v1.2.3). Defaults to the latest release."),
     repo: str = typer.Option(DEFAULT_GH_REPO, "--repo", help="GitHub repo slug 'owner/name' to fetch releases from."),
     dry_run: bool = typer.Option(False, "--dry-run", help="Only check and print what would be done; do not modify files."),
+    rollback: bool = typer.Option(False, "--rollback", help="Restore the executable replaced by the last self-update."),
 ):
     """Self-update the openmower zipapp from GitHub Releases.
 
-    This command downloads the latest (or specified) release artifact and replaces the currently running
-    zipapp executable with the new version.
+    This command downloads the latest (or specified) release artifact, verifies its published SHA-256 and
+    replaces the currently running zipapp executable with the new version. The replaced executable is kept
+    as `<exe>.prev` for `--rollback`.
     """
 
     exe_path = Path(sys.argv[0]).resolve()
@@ -182,12 +574,19 @@ def self_update(
         error(f"Current executable does not look like a zipapp: {exe_path}. Exiting.")
         raise typer.Exit(code=1)
 
+    if rollback:
+        _rollback(exe_path)
+        return
+
     from openmower_cli.helpers import fetch_github_release_zip
 
     info("Fetching release artifact from GitHub ...")
     try:
+        # Download next to the executable when possible, so installing is a rename instead of a copy
+        tmp_parent = exe_path.parent if os.access(exe_path.parent, os.W_OK) else None
         # We expect asset name to end with .zip; our helper will pick first zip if multiple
-        zip_path, tag_name, tmp_handle = fetch_github_release_zip(repo, expected_asset_suffix=None, tag=version)
+        zip_path, tag_name, tmp_handle = fetch_github_release_zip(repo, expected_asset_suffix=None, tag=version,
+                                                                  tmp_parent=tmp_parent)
     except Exception as e:
         error(str(e))
         raise typer.Exit(code=1)
@@ -201,39 +600,31 @@ def self_update(
         # Extract and locate the shiv executable (likely named 'openmower')
         td = zip_path.parent
         info("Extracting artifact ...")
-        with zipfile.ZipFile(zip_path) as zf:
-            zf.extractall(td)
-
-        new_bin = td / "openmower"
-        if not new_bin.exists() or not new_bin.is_file():
+        try:
+            with zipfile.ZipFile(zip_path) as zf:
+                new_bin = Path(zf.extract("openmower", td))
+        except KeyError:
             error("Failed to locate 'openmower' executable inside the downloaded ZIP.")
             raise typer.Exit(code=1)
-
-        # Ensure executable permissions
-        st = os.stat(new_bin)
-        os.chmod(new_bin, st.st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        except zipfile.BadZipFile as e:
+            error(f"Downloaded ZIP is corrupt: {e}")
+            raise typer.Exit(code=1)
+        if not zipfile.is_zipfile(new_bin):
+            error("Extracted 'openmower' is not a zipapp; refusing to install it.")
+            raise typer.Exit(code=1)
 
         # Replace current executable atomically
         info(f"Updating {exe_path} ...")
         try:
-            # Write to a temp path in the same directory for atomic replace
-            target_dir = exe_path.parent
-            tmp_target = target_dir / (exe_path.name + ".tmp")
-            # Copy contents
-            with open(new_bin, 'rb') as src, open(tmp_target, 'wb') as dst:
-                while True:
-                    chunk = src.read(1024 * 256)
-                    if not chunk:
-                        break
-                    dst.write(chunk)
-            # Preserve executable bits
-            st = os.stat(tmp_target)
-            os.chmod(tmp_target, st.st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+            tmp_target = _stage_next_to(new_bin, exe_path)
+            _snapshot(exe_path, exe_path.with_name(exe_path.name + ".prev"))
             os.replace(tmp_target, exe_path)
+            _fsync_path(exe_path.parent)
         except PermissionError as e:
             error(f"Failed to update executable at: {e}.")
             raise typer.Exit(code=1)
-        success(f"Updated successfully to {tag_name or 'latest'}. Please re-run the command.")
+        success(f"Updated successfully to {tag_name or 'latest'}. Please re-run the command. "
+                f"Use 'openmower self-update --rollback' to go back.")
     finally:
         # Always cleanup temporary download directory
         try:
@@ -1,8 +1,9 @@
 import signal
 import subprocess
 import os
+from pathlib import Path
 from typing import Optional
-from openmower_cli.helpers import which, run
+from openmower_cli.helpers import which, run, record_state, bump_counters
 import typer
 from openmower_cli.console import info, warn, error, success
 
@@ -22,9 +23,10 @@ FW_URL_BASE = "https://github.com/ClemensElflein/OpenMower"
 FW_URL = f"{FW_URL_BASE}/releases/download/latest/firmware"
 
 
-def _run_socat(port: int, device: str) -> int:
+def _run_socat(port: int, device: str, counters=None) -> int:
     """Run socat in a loop like the bash script until interrupted.
 
+    Socat restarts and failed runs are counted in `counters` (a BridgeCounters) if given.
     Returns the final exit code (0 for graceful Ctrl-C).
     """
     running = True
@@ -48,7 +50,11 @@ def _run_socat(port: int, device: str) -> int:
             f"FILE:{device},b115200,cs8,raw,echo=0",
         ]
         try:
-            subprocess.run(cmd)
+            proc = subprocess.run(cmd)
+            if counters and running:
+                counters.add("restarts")
+                if proc.returncode != 0:
+                    counters.add("errors")
         except FileNotFoundError as e:
             error(f"{e}")
             return 127
@@ -150,15 +156,76 @@ def openocd_cmd():
 def serial_bridge(
     which: str = typer.Argument(..., help="Which device to bridge: left, right, mower"),
     port: int = typer.Option(DEFAULT_PORT, "--port", "-p", help=f"TCP port to listen on (default: {DEFAULT_PORT})"),
+    capture: Optional[Path] = typer.Option(None, "--capture", help="Record all traffic (both directions, timestamped) into this capture ring file."),
+    capture_size: int = typer.Option(16, "--capture-size", min=1, help="Capture ring size in MiB; oldest traffic is overwritten."),
+    relay: bool = typer.Option(False, "--relay", help="Forward through the CLI (one client at a time) so `openmower metrics` also gets byte counts."),
 ):
-    """Expose a serial device over TCP via socat (legacy behavior)."""
+    """Expose a serial device over TCP via socat (legacy behavior).
+
+    socat restarts and failures are counted for `openmower metrics`. With --relay or --capture, traffic is
+    forwarded through the CLI instead, which also counts bytes; --capture additionally records it into a
+    memory-mapped ring file that `xesc-replay` can play back.
+    """
     device: Optional[str] = DEVICE_MAP.get(which)
     if device is None:
         valid = ", ".join(sorted(DEVICE_MAP))
         error(f"Error: Invalid argument. Valid values are: {valid}.")
         raise typer.Exit(code=2)
 
-    code = _run_socat(port=port, device=device)
+    from openmower_cli.constants import XESC_STATS_DIR
+    from openmower_cli.serial_capture import BridgeCounters, CaptureRing, run_bridge
+    relay = relay or capture is not None
+    try:
+        counters = BridgeCounters(XESC_STATS_DIR / f"{which}.stats", counts_bytes=relay)
+    except OSError as e:
+        warn(f"Bridge counters disabled: {e}")
+        counters = None
+
+    try:
+        if not relay:
+            code = _run_socat(port=port, device=device, counters=counters)
+        elif capture is None:
+            code = run_bridge(port=port, device=device, counters=counters)
+        else:
+            try:
+                ring = CaptureRing(capture, capacity=capture_size * 1024 * 1024, device=device)
+            except (OSError, ValueError) as e:
+                error(f"{e}")
+                raise typer.Exit(code=1)
+            try:
+                code = run_bridge(port=port, device=device, ring=ring, counters=counters)
+            finally:
+                ring.close()
+    finally:
+        if counters:
+            counters.close()
+    raise typer.Exit(code=code)
+
+
+@openmower_legacy_app.command("xesc-replay")
+def xesc_replay(
+    capture: Path = typer.Argument(..., help="Capture file recorded with `expose-xesc --capture`"),
+    port: Optional[int] = typer.Option(None, "--port", "-p", help="Serve the replay to a TCP client on this port instead of a pty."),
+    link: Optional[Path] = typer.Option(None, "--link", help="Create a symlink to the replay pty at this path (e.g. /tmp/ttyXESC)."),
+    speed: float = typer.Option(1.0, "--speed", help="Playback speed factor; 0 replays as fast as possible."),
+    to_device: bool = typer.Option(False, "--to-device", help="Replay the traffic sent to the device instead of the device's replies."),
+):
+    """Replay a serial capture into a pty (default) or a TCP client at original or accelerated speed."""
+    from openmower_cli.serial_capture import CaptureRing, FROM_DEVICE, TO_DEVICE, replay_pty, replay_tcp
+    try:
+        ring = CaptureRing(capture)
+    except (OSError, ValueError) as e:
+        error(f"{e}")
+        raise typer.Exit(code=1)
+    direction = TO_DEVICE if to_device else FROM_DEVICE
+    info(f"Capture of {ring.device or 'unknown device'}: {ring.head - ring.tail} bytes buffered.")
+    try:
+        if port is not None:
+            code = replay_tcp(ring, direction, speed, port)
+        else:
+            code = replay_pty(ring, direction, speed, link)
+    finally:
+        ring.close()
     raise typer.Exit(code=code)
 
 
@@ -168,8 +235,9 @@ def update_firmware():
 
     - Requires OM_HARDWARE_VERSION environment variable to be set (from /boot/openmower/mower_config.txt).
     - Uses a temporary directory and does not write into $HOME.
-    - Downloads firmware.zip and verifies checksum against the latest release.
-    - Extracts firmware/<OM_HARDWARE_VERSION>/firmware.elf into a temp file.
+    - Validates OM_HARDWARE_VERSION against the latest firmware.zip's table of contents and fetches only
+      firmware/<OM_HARDWARE_VERSION>/firmware.elf via HTTP range requests.
+    - Falls back to downloading firmware.zip and extracting the firmware from it.
     - Uploads the extracted firmware.elf via openocd.
     """
     import tempfile
@@ -187,37 +255,69 @@ def update_firmware():
             error("OM_HARDWARE_VERSION is not specified\nPlease configure it at /boot/openmower/mower_config.txt before running this command again!")
             raise typer.Exit(code=1)
 
-        info(f"Downloading latest firmware.zip from \"{FW_URL_BASE}\"...")
-        try:
-            with urllib.request.urlopen(f"{FW_URL}.zip") as resp, open(local_zip, "wb") as out:
-                # Stream download in chunks
-                while True:
-                    chunk = resp.read(1024 * 64)
-                    if not chunk:
-                        break
-                    out.write(chunk)
-        except urllib.error.URLError as e:
-            error(f"Failed to download firmware.zip: {e}")
-            raise typer.Exit(code=1)
-        success("Firmware downloaded successfully.")
-
-        # Extract the correct firmware.elf from the zip
-        info(f"Extracting firmware for \"{hw}\"")
-        import zipfile
-
-        member_path = f"firmware/{hw}/firmware.elf"
+        # Validate the hardware version against the archive's table of contents and fetch only its
+        # firmware.elf via HTTP range requests; fall back to downloading the whole firmware.zip
+        fetched = False
         try:
-            with zipfile.ZipFile(local_zip, "r") as zf:
-                with zf.open(member_path) as src, open(local_fw, "wb") as dst:
-                    dst.write(src.read())
-        except KeyError:
-            error(f"Firmware for hardware version '{hw}' not found in archive.")
-            raise typer.Exit(code=2)
-        success("Firmware extracted successfully.")
+            from openmower_cli.firmware_catalog import LEGACY_SOURCE, catalog, fetch_variant
+            tag, asset, found = catalog(LEGACY_SOURCE)
+        except Exception as e:
+            warn(f"Could not read the firmware catalog ({e}); downloading the full firmware.zip.")
+            found = None
+        if found is not None:
+            if hw not in found:
+                error(f"Firmware for hardware version '{hw}' not found in archive. Available: {', '.join(found) or 'none'}.")
+                raise typer.Exit(code=2)
+            info(f"Downloading firmware for \"{hw}\" from \"{FW_URL_BASE}\"...")
+            try:
+                fetch_variant(asset, found[hw], Path(local_fw))
+                fetched = True
+                success("Firmware downloaded successfully.")
+            except Exception as e:
+                warn(f"Ranged firmware download failed ({e}); downloading the full firmware.zip.")
+
+        if not fetched:
+            info(f"Downloading latest firmware.zip from \"{FW_URL_BASE}\"...")
+            import time
+            started = time.monotonic()
+            try:
+                with urllib.request.urlopen(f"{FW_URL}.zip") as resp, open(local_zip, "wb") as out:
+                    # Stream download in chunks
+                    while True:
+                        chunk = resp.read(1024 * 64)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+            except urllib.error.URLError as e:
+                bump_counters(download_failures_total=1)
+                error(f"Failed to download firmware.zip: {e}")
+                raise typer.Exit(code=1)
+            bump_counters(downloads_total=1, download_bytes_total=os.path.getsize(local_zip),
+                          download_seconds_total=time.monotonic() - started)
+            success("Firmware downloaded successfully.")
+
+            # Extract the correct firmware.elf from the zip
+            info(f"Extracting firmware for \"{hw}\"")
+            import zipfile
+
+            member_path = f"firmware/{hw}/firmware.elf"
+            try:
+                with zipfile.ZipFile(local_zip, "r") as zf:
+                    with zf.open(member_path) as src, open(local_fw, "wb") as dst:
+                        dst.write(src.read())
+            except KeyError:
+                error(f"Firmware for hardware version '{hw}' not found in archive.")
+                raise typer.Exit(code=2)
+            success("Firmware extracted successfully.")
 
         info(f"Executing flash script with firmware \"{local_fw}\":")
 
-        flash_pico(local_fw)
+        try:
+            flash_pico(local_fw)
+        except typer.Exit:
+            record_state("firmware_flash", ok=False, release="latest", target=hw)
+            raise
+        record_state("firmware_flash", ok=True, release="latest", target=hw)
 
         success("Firmware updated successfully.")
     finally:
@@ -0,0 +1,130 @@
+import struct
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+# Read zip archives over HTTP without downloading them.
+#
+# The end-of-central-directory record sits in the last <= 64 KiB of the file, and the central directory
+# it points to lists every member with its compressed size and local header offset. Two or three
+# `Range` requests therefore give a full table of contents, and one more fetches a single member.
+
+_EOCD_SIG = b"PK\x05\x06"
+_EOCD = struct.Struct("<4s4H2LH")
+_ZIP64_LOCATOR_SIG = b"PK\x06\x07"
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_CENTRAL_SIG = b"PK\x01\x02"
+_CENTRAL = struct.Struct("<4s6H3L5H2L")
+_LOCAL_SIG = b"PK\x03\x04"
+_LOCAL = struct.Struct("<4s5H3L2H")
+
+TAIL_SIZE = _EOCD.size + 0xFFFF  # EOCD record plus the longest possible archive comment
+LOCAL_HEADER_SLACK = 1024  # extra bytes requested in case the local extra field is longer than the central one
+
+
+class RangeNotSupported(RuntimeError):
+    pass
+
+
+def _get_range(session: requests.Session, url: str, start: Optional[int], end: Optional[int]) -> Tuple[bytes, int]:
+    """Fetch bytes [start, end] (or the last `-end` bytes if start is None). Returns (data, total size)."""
+    spec = f"bytes=-{end}" if start is None else f"bytes={start}-{end}"
+    r = session.get(url, headers={"Range": spec}, timeout=60)
+    if r.status_code != 206:
+        raise RangeNotSupported(f"Server did not honour range request (HTTP {r.status_code})")
+    total = int(r.headers.get("Content-Range", "*/0").rsplit("/", 1)[1] or 0)
+    return r.content, total
+
+
+def _zip64_extra(extra: bytes, size: int, comp_size: int, offset: int) -> Tuple[int, int, int]:
+    """Apply the ZIP64 extended information extra field (0x0001) to 0xFFFFFFFF placeholders."""
+    pos = 0
+    while pos + 4 <= len(extra):
+        tag, length = struct.unpack_from("<HH", extra, pos)
+        if tag == 0x0001:
+            values = list(struct.unpack_from(f"<{length // 8}Q", extra, pos + 4))
+            if size == 0xFFFFFFFF and values:
+                size = values.pop(0)
+            if comp_size == 0xFFFFFFFF and values:
+                comp_size = values.pop(0)
+            if offset == 0xFFFFFFFF and values:
+                offset = values.pop(0)
+            break
+        pos += 4 + length
+    return size, comp_size, offset
+
+
+def parse_central_directory(data: bytes, count: int) -> List[Dict]:
+    """Parse `count` central directory records into table of contents entries."""
+    entries = []
+    pos = 0
+    for _ in range(count):
+        (sig, _made_by, _needed, flags, method, _time, _date, crc, comp_size, size,
+         name_len, extra_len, comment_len, _disk, _int_attr, _ext_attr, offset) = _CENTRAL.unpack_from(data, pos)
+        if sig != _CENTRAL_SIG:
+            raise ValueError("Corrupt zip central directory")
+        pos += _CENTRAL.size
+        raw_name = data[pos:pos + name_len]
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = data[pos + name_len:pos + name_len + extra_len]
+        size, comp_size, offset = _zip64_extra(extra, size, comp_size, offset)
+        pos += name_len + extra_len + comment_len
+        entries.append({"name": name, "method": method, "crc": crc, "compressed_size": comp_size,
+                        "size": size, "header_offset": offset, "name_length": name_len})
+    return entries
+
+
+def read_toc(session: requests.Session, url: str) -> List[Dict]:
+    """Read the table of contents of a remote zip using range requests only."""
+    tail, total = _get_range(session, url, None, TAIL_SIZE)
+    tail_start = total - len(tail)
+    idx = tail.rfind(_EOCD_SIG)
+    if idx < 0:
+        raise ValueError("End of central directory record not found; not a zip file?")
+    _, _, _, _, count, cd_size, cd_offset, _ = _EOCD.unpack_from(tail, idx)
+
+    if cd_offset == 0xFFFFFFFF or count == 0xFFFF or cd_size == 0xFFFFFFFF:
+        loc = idx - _ZIP64_LOCATOR.size
+        sig, _, eocd64_offset, _ = _ZIP64_LOCATOR.unpack_from(tail, loc)
+        if sig != _ZIP64_LOCATOR_SIG:
+            raise ValueError("Corrupt ZIP64 end of central directory locator")
+        if eocd64_offset >= tail_start:
+            rec = tail[eocd64_offset - tail_start:]
+        else:
+            rec, _ = _get_range(session, url, eocd64_offset, eocd64_offset + _ZIP64_EOCD.size - 1)
+        fields = _ZIP64_EOCD.unpack_from(rec, 0)
+        count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+
+    if cd_offset >= tail_start:
+        cd = tail[cd_offset - tail_start:cd_offset - tail_start + cd_size]
+    else:
+        cd, _ = _get_range(session, url, cd_offset, cd_offset + cd_size - 1)
+    return parse_central_directory(cd, count)
+
+
+def fetch_member(session: requests.Session, url: str, entry: Dict) -> bytes:
+    """Fetch and decompress a single member described by a table of contents entry, verifying its CRC-32."""
+    start = entry["header_offset"]
+    want = _LOCAL.size + entry["name_length"] + LOCAL_HEADER_SLACK + entry["compressed_size"]
+    data, _ = _get_range(session, url, start, start + want - 1)
+    sig, _, _, _, _, _, _, _, _, name_len, extra_len = _LOCAL.unpack_from(data, 0)
+    if sig != _LOCAL_SIG:
+        raise ValueError(f"Corrupt local header for {entry['name']}")
+    begin = _LOCAL.size + name_len + extra_len
+    payload = data[begin:begin + entry["compressed_size"]]
+    if len(payload) < entry["compressed_size"]:
+        # Unusually long local extra field: fetch the exact remainder
+        more, _ = _get_range(session, url, start + len(data), start + begin + entry["compressed_size"] - 1)
+        payload += more
+
+    if entry["method"] == 0:
+        content = payload
+    elif entry["method"] == 8:
+        content = zlib.decompressobj(-zlib.MAX_WBITS).decompress(payload)
+    else:
+        raise ValueError(f"Unsupported compression method {entry['method']} for {entry['name']}")
+    if zlib.crc32(content) & 0xFFFFFFFF != entry["crc"]:
+        raise ValueError(f"CRC mismatch for {entry['name']}")
+    return content
@@ -0,0 +1,348 @@
+import mmap
+import os
+import select
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+import tty
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from openmower_cli.console import info, error
+
+# Fixed-size, memory-mapped capture ring for serial traffic.
+#
+# Layout: a 64 byte header followed by `capacity` bytes of ring data. Each record is a 16 byte header
+# (payload length, direction, wall clock timestamp) followed by the payload; records may wrap around the
+# end of the data area. `head` and `tail` are monotonically increasing byte offsets: the writer evicts
+# whole records at `tail` before overwriting them, so readers can always walk records from `tail`.
+
+MAGIC = b"OMXCAP1\0"
+_HEADER = struct.Struct("<8sQQQd24s")  # magic, capacity, head, tail, created, device
+HEADER_SIZE = 64
+_RECORD = struct.Struct("<IB3xd")  # length, direction, timestamp
+RECORD_SIZE = _RECORD.size
+
+# Directions, seen from the serial device
+FROM_DEVICE = 0
+TO_DEVICE = 1
+
+DEFAULT_CAPTURE_SIZE = 16 * 1024 * 1024
+
+
+class CaptureRing:
+    """A capture file mapped into memory. Appending a chunk is two memcpys and a header update."""
+
+    def __init__(self, path: Path, capacity: Optional[int] = None, device: str = ""):
+        """Open an existing capture, or create a new one when `capacity` is given."""
+        self.path = path
+        if capacity is not None:
+            if capacity <= RECORD_SIZE:
+                raise ValueError(f"Capture capacity must be larger than {RECORD_SIZE} bytes.")
+            with open(path, "wb") as f:
+                f.truncate(HEADER_SIZE + capacity)
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        if capacity is not None:
+            _HEADER.pack_into(self._mm, 0, MAGIC, capacity, 0, 0, time.time(), device.encode()[:24])
+        magic, self.capacity, self.head, self.tail, self.created, dev = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a serial capture file.")
+        self.device = dev.rstrip(b"\0").decode(errors="replace")
+
+    def _put(self, pos: int, data: bytes) -> None:
+        off = pos % self.capacity
+        first = min(len(data), self.capacity - off)
+        self._mm[HEADER_SIZE + off:HEADER_SIZE + off + first] = data[:first]
+        if first < len(data):
+            self._mm[HEADER_SIZE:HEADER_SIZE + len(data) - first] = data[first:]
+
+    def _get(self, pos: int, size: int) -> bytes:
+        off = pos % self.capacity
+        first = min(size, self.capacity - off)
+        data = self._mm[HEADER_SIZE + off:HEADER_SIZE + off + first]
+        if first < size:
+            data += self._mm[HEADER_SIZE:HEADER_SIZE + size - first]
+        return data
+
+    def record(self, direction: int, data: bytes, ts: Optional[float] = None) -> None:
+        """Append one chunk, evicting the oldest records if the ring is full."""
+        data = data[:self.capacity - RECORD_SIZE]
+        size = RECORD_SIZE + len(data)
+        while self.head + size - self.tail > self.capacity:
+            length, _, _ = _RECORD.unpack(self._get(self.tail, RECORD_SIZE))
+            self.tail += RECORD_SIZE + length
+        self._put(self.head, _RECORD.pack(len(data), direction, time.time() if ts is None else ts))
+        self._put(self.head + RECORD_SIZE, data)
+        self.head += size
+        struct.pack_into("<QQ", self._mm, 16, self.head, self.tail)
+
+    def records(self) -> Iterator[Tuple[float, int, bytes]]:
+        """Yield (timestamp, direction, payload) for every record currently in the ring, oldest first."""
+        pos = self.tail
+        while pos < self.head:
+            length, direction, ts = _RECORD.unpack(self._get(pos, RECORD_SIZE))
+            yield ts, direction, self._get(pos + RECORD_SIZE, length)
+            pos += RECORD_SIZE + length
+
+    def close(self) -> None:
+        try:
+            self._mm.flush()
+            self._mm.close()
+        finally:
+            self._file.close()
+
+
+_COUNTERS = struct.Struct("<QQQQQdQ")
+COUNTER_FIELDS = ("bytes_from_device", "bytes_to_device", "errors", "restarts", "clients")
+
+
+class BridgeCounters:
+    """Per-device bridge counters in a tiny memory-mapped file, so `openmower metrics` can read them from outside.
+
+    Counters continue from the values in an existing file, keeping them monotonic across bridge restarts.
+    `counts_bytes` records whether the running bridge sees the traffic (the CLI relay) or not (plain socat).
+    """
+
+    def __init__(self, path: Path, counts_bytes: bool = False):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < _COUNTERS.size:
+                os.ftruncate(fd, _COUNTERS.size)
+            self._mm = mmap.mmap(fd, _COUNTERS.size)
+        finally:
+            os.close(fd)
+        self._values = list(_COUNTERS.unpack_from(self._mm, 0)[:len(COUNTER_FIELDS)])
+        self._counts_bytes = int(counts_bytes)
+        self._write()
+
+    def _write(self) -> None:
+        _COUNTERS.pack_into(self._mm, 0, *self._values, time.time(), self._counts_bytes)
+
+    def add(self, field: str, n: int = 1) -> None:
+        self._values[COUNTER_FIELDS.index(field)] += n
+        self._write()
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def read_bridge_counters(stats_dir: Path) -> Dict[str, dict]:
+    """Read the counters of every bridge that has run, keyed by device name (file stem)."""
+    result: Dict[str, dict] = {}
+    for path in sorted(stats_dir.glob("*.stats")):
+        try:
+            data = path.read_bytes()[:_COUNTERS.size]
+            values = _COUNTERS.unpack(data.ljust(_COUNTERS.size, b"\0"))
+        except (OSError, struct.error):
+            continue
+        counters = dict(zip(COUNTER_FIELDS + ("updated", "counts_bytes"), values))
+        counters["counts_bytes"] = bool(counters["counts_bytes"])
+        result[path.stem] = counters
+    return result
+
+
+def _socat_stdio_cmd(device: str) -> List[str]:
+    return ["sudo", "socat", "-", f"FILE:{device},b115200,cs8,raw,echo=0"]
+
+
+def _listen(port: int) -> socket.socket:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("0.0.0.0", port))
+        server.listen(1)
+    except OSError:
+        server.close()
+        raise
+    return server
+
+
+def run_bridge(port: int, device: str, ring: Optional[CaptureRing] = None,
+               counters: Optional[BridgeCounters] = None) -> int:
+    """Bridge a TCP client to the serial device like `_run_socat`, counting traffic in `counters` and
+    recording every chunk into `ring` if given.
+
+    The device is still opened through socat (as root) and talks to us over pipes; a new TCP client
+    replaces the previous one. Returns the final exit code (0 for graceful Ctrl-C).
+    """
+    running = True
+
+    def _handle_sigint(signum, frame):
+        nonlocal running
+        info("Interrupt received! Stopping...")
+        running = False
+
+    signal.signal(signal.SIGINT, _handle_sigint)
+
+    try:
+        server = _listen(port)
+    except OSError as e:
+        error(f"Cannot listen on port {port}: {e}")
+        return 1
+    client: Optional[socket.socket] = None
+
+    capturing = f", capturing to {ring.path}" if ring else ""
+    info(f"Bridging device: {device} on port: {port}{capturing} ...")
+    try:
+        while running:
+            try:
+                proc = subprocess.Popen(_socat_stdio_cmd(device), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        bufsize=0)
+            except FileNotFoundError as e:
+                error(f"{e}")
+                return 127
+            dev_out = proc.stdout.fileno()
+            dev_in = proc.stdin.fileno()
+            while running:
+                fds = [server, dev_out] + ([client] if client else [])
+                try:
+                    readable, _, _ = select.select(fds, [], [], 0.5)
+                except InterruptedError:
+                    continue
+                if server in readable:
+                    conn, addr = server.accept()
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    if client:
+                        client.close()
+                    client = conn
+                    if counters:
+                        counters.add("clients")
+                    info(f"Client connected from {addr[0]}:{addr[1]}")
+                if dev_out in readable:
+                    data = os.read(dev_out, 65536)
+                    if not data:
+                        break  # socat exited; restart it
+                    if ring:
+                        ring.record(FROM_DEVICE, data)
+                    if counters:
+                        counters.add("bytes_from_device", len(data))
+                    if client:
+                        try:
+                            client.sendall(data)
+                        except OSError:
+                            if counters:
+                                counters.add("errors")
+                            client.close()
+                            client = None
+                if client and client in readable:
+                    try:
+                        data = client.recv(65536)
+                    except OSError:
+                        data = b""
+                    if not data:
+                        client.close()
+                        client = None
+                        continue
+                    if ring:
+                        ring.record(TO_DEVICE, data)
+                    if counters:
+                        counters.add("bytes_to_device", len(data))
+                    try:
+                        os.write(dev_in, data)
+                    except BrokenPipeError:
+                        if counters:
+                            counters.add("errors")
+                        break
+            if proc.poll() is None:
+                proc.terminate()
+            proc.wait()
+            if running:
+                if counters:
+                    counters.add("restarts")
+                    if proc.returncode != 0:
+                        counters.add("errors")
+                time.sleep(1)
+    finally:
+        if client:
+            client.close()
+        server.close()
+    return 0
+
+
+def _paced(ring: CaptureRing, direction: int, speed: float) -> Iterator[bytes]:
+    """Yield payloads of one direction, sleeping to reproduce the captured timing divided by `speed`."""
+    start_wall = time.monotonic()
+    first_ts = None
+    for ts, d, data in ring.records():
+        if d != direction:
+            continue
+        if first_ts is None:
+            first_ts = ts
+        if speed > 0:
+            delay = (ts - first_ts) / speed - (time.monotonic() - start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        yield data
+
+
+def replay_pty(ring: CaptureRing, direction: int, speed: float, link: Optional[Path] = None) -> int:
+    """Replay a capture into a new pseudo terminal, as if it were the serial device.
+
+    Waits for Enter before starting when stdin is a terminal; otherwise (scripts, services) starts right away.
+    """
+    if link and not link.is_symlink() and link.exists():
+        error(f"{link} exists and is not a symlink; refusing to replace it.")
+        return 1
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    name = os.ttyname(slave)
+    if link:
+        try:
+            if link.is_symlink():
+                link.unlink()
+            link.symlink_to(name)
+        except OSError as e:
+            os.close(master)
+            os.close(slave)
+            error(f"Cannot create link {link}: {e}")
+            return 1
+        name = f"{link} -> {name}"
+    try:
+        if sys.stdin.isatty():
+            info(f"Replaying {ring.path} on {name}. Press Enter to start ...")
+            input()
+        else:
+            info(f"Replaying {ring.path} on {name} ...")
+        for data in _paced(ring, direction, speed):
+            os.write(master, data)
+        info("Replay finished.")
+    except (KeyboardInterrupt, EOFError):
+        info("Interrupt received! Stopping...")
+    finally:
+        os.close(master)
+        os.close(slave)
+        if link and link.is_symlink():
+            link.unlink()
+    return 0
+
+
+def replay_tcp(ring: CaptureRing, direction: int, speed: float, port: int) -> int:
+    """Replay a capture to the next TCP client connecting on `port`, as `expose-xesc` would serve it."""
+    try:
+        server = _listen(port)
+    except OSError as e:
+        error(f"Cannot listen on port {port}: {e}")
+        return 1
+    info(f"Waiting for a client on port {port} to replay {ring.path} ...")
+    try:
+        conn, addr = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        info(f"Client connected from {addr[0]}:{addr[1]}, replaying ...")
+        with conn:
+            for data in _paced(ring, direction, speed):
+                conn.sendall(data)
+        info("Replay finished.")
+    except KeyboardInterrupt:
+        info("Interrupt received! Stopping...")
+    except OSError as e:
+        error(f"Replay aborted: {e}")
+        return 1
+    finally:
+        server.close()
+    return 0
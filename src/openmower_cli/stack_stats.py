@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Live resource statistics for the compose stack, from the Docker stats streams.
+#
+# One thread per container consumes its stats stream and only keeps the latest computed sample;
+# consumers call `snapshot()` at their own pace, so bursts of updates are coalesced for free.
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+DISCOVERY_INTERVAL = 5.0
+
+
+def cpu_percent(stats: dict) -> float:
+    """CPU usage in percent of one core, computed like `docker stats` from the sample and its precpu sample."""
+    cpu = stats.get("cpu_stats") or {}
+    pre = stats.get("precpu_stats") or {}
+    cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (pre.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - pre.get("system_cpu_usage", 0)
+    if cpu_delta <= 0 or system_delta <= 0:
+        return 0.0
+    online = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+    return cpu_delta / system_delta * online * 100.0
+
+
+def memory_usage(stats: dict) -> tuple[int, int]:
+    """Return (used, limit) bytes, excluding page cache like `docker stats` does."""
+    mem = stats.get("memory_stats") or {}
+    usage = mem.get("usage", 0)
+    detail = mem.get("stats") or {}
+    # cgroup v2 reports inactive_file, cgroup v1 reports cache
+    cache = detail.get("inactive_file", detail.get("total_inactive_file", detail.get("cache", 0)))
+    return max(usage - cache, 0), mem.get("limit", 0)
+
+
+def network_bytes(stats: dict) -> tuple[int, int]:
+    rx = tx = 0
+    for iface in (stats.get("networks") or {}).values():
+        rx += iface.get("rx_bytes", 0)
+        tx += iface.get("tx_bytes", 0)
+    return rx, tx
+
+
+def block_bytes(stats: dict) -> tuple[int, int]:
+    read = write = 0
+    for entry in (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            read += entry.get("value", 0)
+        elif op == "write":
+            write += entry.get("value", 0)
+    return read, write
+
+
+class StackStatsCollector:
+    """Follows the stats streams of all containers of a compose project."""
+
+    def __init__(self, client, project: str):
+        self._client = client
+        self._project = project
+        self._lock = threading.Lock()
+        self._samples: Dict[str, dict] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self._discover()
+        threading.Thread(target=self._discovery_loop, daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _discovery_loop(self) -> None:
+        while not self._stop.wait(DISCOVERY_INTERVAL):
+            try:
+                self._discover()
+            except Exception:
+                pass
+
+    def _discover(self) -> None:
+        containers = self._client.containers.list(filters={"label": f"{PROJECT_LABEL}={self._project}"})
+        alive = {c.id for c in containers}
+        for cid in list(self._threads):
+            if cid not in alive:
+                # Its stats stream ends with the container; the thread exits on its own
+                del self._threads[cid]
+        for c in containers:
+            t = self._threads.get(c.id)
+            if t is None or not t.is_alive():
+                t = threading.Thread(target=self._follow, args=(c,), daemon=True)
+                self._threads[c.id] = t
+                t.start()
+        with self._lock:
+            for cid in list(self._samples):
+                if cid not in alive:
+                    del self._samples[cid]
+
+    def _follow(self, container) -> None:
+        service = container.labels.get(SERVICE_LABEL, container.name)
+        prev: Optional[tuple] = None
+        try:
+            for stats in container.stats(stream=True, decode=True):
+                if self._stop.is_set():
+                    return
+                now = time.monotonic()
+                net = network_bytes(stats)
+                blk = block_bytes(stats)
+                mem_used, mem_limit = memory_usage(stats)
+                rates = (0.0, 0.0, 0.0, 0.0)
+                if prev is not None and now > prev[0]:
+                    dt = now - prev[0]
+                    rates = ((net[0] - prev[1][0]) / dt, (net[1] - prev[1][1]) / dt,
+                             (blk[0] - prev[2][0]) / dt, (blk[1] - prev[2][1]) / dt)
+                prev = (now, net, blk)
+                sample = {
+                    "service": service,
+                    "container": container.name,
+                    "cpu_percent": round(cpu_percent(stats), 2),
+                    "mem_bytes": mem_used,
+                    "mem_limit": mem_limit,
+                    "net_rx_rate": max(rates[0], 0.0),
+                    "net_tx_rate": max(rates[1], 0.0),
+                    "blk_read_rate": max(rates[2], 0.0),
+                    "blk_write_rate": max(rates[3], 0.0),
+                    "pids": (stats.get("pids_stats") or {}).get("current", 0),
+                }
+                with self._lock:
+                    self._samples[container.id] = sample
+        except Exception:
+            # Container went away; discovery picks up its replacement
+            return
+
+    def snapshot(self) -> List[dict]:
+        """Latest sample of every container, sorted by service name."""
+        with self._lock:
+            return sorted(self._samples.values(), key=lambda s: (s["service"], s["container"]))
@@ -0,0 +1,107 @@
+import queue
+import threading
+
+from openmower_cli import log_archive
+
+
+class _FakeProc:
+    def __init__(self, lines, stop):
+        self.stdout = iter(lines)
+        self._stop = stop
+
+    def wait(self):
+        return 0
+
+
+def _follow(monkeypatch, runs, since=None):
+    """Run _follow_service against fake `compose logs` runs; returns (queued messages, --since of each run)."""
+    stop = threading.Event()
+    calls = []
+
+    def fake_popen(cmd, **kwargs):
+        calls.append(cmd[cmd.index("--since") + 1] if "--since" in cmd else None)
+        if len(calls) == len(runs):
+            stop.set()
+        return _FakeProc(runs[len(calls) - 1], stop)
+
+    monkeypatch.setattr(log_archive.subprocess, "Popen", fake_popen)
+    monkeypatch.setattr(log_archive, "RESTART_DELAY", 0)
+    out = queue.Queue()
+    log_archive._follow_service(["docker", "compose"], "ros", since, out, stop, {})
+    return [out.get_nowait()[2] for _ in range(out.qsize())], calls
+
+
+def test_keeps_lines_sharing_a_timestamp(monkeypatch):
+    lines = [
+        "2024-05-01T14:00:00.000000100Z line-a\n",
+        "2024-05-01T14:00:00.000000100Z line-b\n",
+        "2024-05-01T14:00:00.000000223Z line-c\n",
+        "2024-05-01T14:00:01.000000000Z line-d\n",
+    ]
+    messages, _ = _follow(monkeypatch, [lines])
+    assert messages == ["line-a", "line-b", "line-c", "line-d"]
+
+
+def test_restart_skips_only_already_archived_lines(monkeypatch):
+    first = [
+        "2024-05-01T14:00:00.000000Z a\n",
+        "2024-05-01T14:00:01.000000Z b\n",
+        "2024-05-01T14:00:01.000000Z b\n",
+    ]
+    # `--since` is inclusive: the second run repeats the lines at the resume timestamp
+    second = [
+        "2024-05-01T14:00:01.000000Z b\n",
+        "2024-05-01T14:00:01.000000Z b\n",
+        "2024-05-01T14:00:01.000000Z c\n",
+        "2024-05-01T14:00:02.000000Z d\n",
+    ]
+    messages, calls = _follow(monkeypatch, [first, second])
+    assert messages == ["a", "b", "b", "c", "d"]
+    assert calls == [None, "2024-05-01T14:00:01.000000Z"]
+
+
+def test_resume_skips_lines_at_or_before_since(monkeypatch):
+    since = log_archive.parse_docker_timestamp("2024-05-01T14:00:01Z")
+    lines = [
+        "2024-05-01T14:00:00.000000Z old\n",
+        "2024-05-01T14:00:01.000000Z archived\n",
+        "2024-05-01T14:00:02.000000Z new\n",
+        "2024-05-01T14:00:02.000000Z new\n",
+    ]
+    messages, _ = _follow(monkeypatch, [lines], since=since)
+    assert messages == ["new", "new"]
+
+
+def _writer(archive_dir):
+    return log_archive._SegmentWriter(archive_dir, segment_bytes=1 << 20, segment_seconds=3600, keep_bytes=1 << 30)
+
+
+def test_flush_only_rewrites_active_metadata(tmp_path):
+    writer = _writer(tmp_path)
+    writer.write(100.0, "ros", "hello")
+    writer.touch()
+    writer.flush()
+    # Nothing rotated yet: only the small live file is written, but readers already see the active segment
+    assert not (tmp_path / log_archive.INDEX_NAME).exists()
+    assert log_archive.has_archive(tmp_path)
+    assert list(log_archive.query(tmp_path)) == [(100.0, "ros", "hello")]
+    assert log_archive.load_index(tmp_path)["last_seen"] == {"ros": 100.0}
+
+    writer.close()
+    index = log_archive._read_json(tmp_path / log_archive.INDEX_NAME)
+    assert [s["lines"] for s in index["segments"]] == [1]
+    assert log_archive._read_json(tmp_path / log_archive.ACTIVE_NAME)["segment"] is None
+    assert len(log_archive.load_index(tmp_path)["segments"]) == 1
+
+
+def test_segment_of_interrupted_capture_is_kept(tmp_path):
+    crashed = _writer(tmp_path)
+    crashed.write(100.0, "ros", "before crash")
+    crashed.flush()  # no close(): the capture was killed
+
+    writer = _writer(tmp_path)
+    writer.write(200.0, "ros", "after restart")
+    writer.flush()
+    index = log_archive._read_json(tmp_path / log_archive.INDEX_NAME)
+    assert len(index["segments"]) == 1
+    assert [line[2] for line in log_archive.query(tmp_path)] == ["before crash", "after restart"]